@@ -16,10 +16,24 @@ Data: 2025-02-15
 
 import pyaudio
 import asyncio
+import ctypes
+import ctypes.util
+import os
+import re
+import sys
+import threading
+import time
 from typing import Callable, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+# VAD local opcional: permite pedir o Finalize ao Deepgram assim que o
+# silêncio é detectado localmente, sem esperar o endpointing completo
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
 from deepgram import DeepgramClient, AsyncDeepgramClient
 from deepgram.core.events import EventType
 from deepgram.extensions.types.sockets import (
@@ -31,6 +45,70 @@ from deepgram.extensions.types.sockets import (
 )
 
 
+def _instalar_orjson_no_sdk():
+    """
+    Trocar o `json` usado internamente pelo SDK do Deepgram por orjson.
+
+    O SDK parseia cada frame de texto do websocket com o stdlib `json`;
+    orjson (Rust) é 2-3× mais rápido nesses payloads pequenos. O patch é
+    best-effort: percorre os submódulos do SDK já importados e substitui a
+    referência ao stdlib por um shim compatível. Sem orjson instalado (ou
+    se o SDK mudar de estrutura), nada acontece.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return
+
+    import json as _stdlib_json
+    import types
+
+    shim = types.SimpleNamespace(
+        loads=orjson.loads,
+        dumps=lambda obj, *a, **kw: orjson.dumps(obj).decode(),
+        JSONDecodeError=_stdlib_json.JSONDecodeError,
+    )
+
+    for nome, modulo in list(sys.modules.items()):
+        if nome.startswith("deepgram") and getattr(modulo, "json", None) is _stdlib_json:
+            try:
+                modulo.json = shim
+            except (AttributeError, TypeError):
+                pass
+
+
+_instalar_orjson_no_sdk()
+
+
+try:
+    _STDOUT_FD = sys.stdout.fileno()
+except (AttributeError, OSError, ValueError):
+    _STDOUT_FD = 1
+
+
+def _fast_print(data):
+    """
+    Escrita direta no stdout para o caminho quente de eventos.
+
+    `os.write` no fd evita o lock do stdout, a camada de buffering e o
+    flush explícito que `print(..., flush=True)` paga a cada transcrição
+    parcial. Mensagens de inicialização/encerramento continuam com print.
+    """
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    os.write(_STDOUT_FD, data)
+
+
+class _M:
+    """Prefixos de mensagem pré-codificados (evita f-string + encode por evento)"""
+    FALANDO = "🗣️  [Falando...]".encode("utf-8")
+    PARCIAL = "\r🎤 [Parcial]: ".encode("utf-8")
+    FINAL = "\r📝 [Final]: ".encode("utf-8")
+    VOCE_FALANDO = "🗣️  [Você está falando...]".encode("utf-8")
+    TRANSCRICAO = "\r📝 [Transcrição]: ".encode("utf-8")
+    NL = b"\n"
+
+
 class DetectionMethod(Enum):
     """Métodos de detecção de término de fala"""
     ENDPOINTING = "endpointing"  # Baseado em tempo de silêncio
@@ -56,6 +134,24 @@ class DeepgramVoiceAssistant:
     - V2: Voice Agent API com detecção automática
     """
 
+    # Parâmetros de captura de áudio (16 kHz mono int16)
+    FORMAT = pyaudio.paInt16
+    CHANNELS = 1
+    RATE = 16000
+    CHUNK = 1024
+    RING_SLOTS = 64  # capacidade do ring buffer em chunks (~4 s de áudio)
+
+    # Coalescência de envio: agrupar ~128 ms de áudio por frame websocket
+    # (dentro da faixa de 20-250 ms recomendada pelo Deepgram), com flush
+    # forçado por idade para não atrasar o endpointing.
+    TX_FLUSH_BYTES = 4096
+    TX_FLUSH_IDLE_S = 0.15
+
+    # VAD local: frames de 30 ms; após 150 ms de silêncio com o último
+    # transcript já is_final, pedimos o Finalize ao servidor
+    VAD_FRAME_BYTES = 960  # 30 ms a 16 kHz mono int16
+    VAD_SILENCE_FLUSH_MS = 150
+
     def __init__(
         self,
         api_key: str,
@@ -82,10 +178,37 @@ class DeepgramVoiceAssistant:
         self.audio = None
         self.stream = None
         self.is_listening = False
+        self._loop = None  # event loop para despachar I/O de terminal
 
         self._current_transcript = ""
         self._transcript_start_time = None
 
+        # Ring buffer SPSC (single-producer/single-consumer) para captura de áudio:
+        # o callback do PortAudio escreve, o loop de envio drena.
+        self._ring = bytearray(self.CHUNK * 2 * self.RING_SLOTS)
+        self._ring_head = 0  # posição de leitura (consumidor)
+        self._ring_tail = 0  # posição de escrita (produtor/callback)
+        self._ring_event = threading.Event()
+
+        # Pool de wrappers de mensagem reutilizados no loop de envio,
+        # evitando uma alocação nova a cada chunk de áudio.
+        self._msg_pool_v1 = [ListenV1MediaMessage(b"") for _ in range(4)]
+        self._msg_pool_v2 = [ListenV2MediaMessage(data=b"") for _ in range(4)]
+        self._msg_idx = 0
+        self._msg_pool_ok = True  # vira False se a classe for imutável (pydantic frozen)
+
+        # Memo de despacho por classe de mensagem: quando o SDK usa uma
+        # classe concreta por evento, o lookup vira um hash do type object
+        # (comparação de ponteiro) em vez de getattr + comparação de string
+        self._v1_type_memo = {}
+        self._v2_type_memo = {}
+
+        # VAD local (WebRTC) para flush antecipado do endpointing
+        self._vad = webrtcvad.Vad(2) if webrtcvad is not None else None
+        self._silence_ms = 0
+        self._last_is_final = False
+        self._finalize_enviado = False
+
     # ========================================================================
     # MODO V1: Transcrição com Endpointing/UtteranceEnd
     # ========================================================================
@@ -100,6 +223,11 @@ class DeepgramVoiceAssistant:
         print(f"🎤 Iniciando Deepgram V1 ({self.detection_method.value})...")
         print(f"⏱️  Silêncio detectado após: {silence_duration}ms")
 
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+
         self.client = DeepgramClient(self.api_key)
 
         # Configurar parâmetros baseados no método de detecção
@@ -148,49 +276,100 @@ class DeepgramVoiceAssistant:
         # Iniciar captura de áudio
         self._start_microphone()
 
-    def _on_message_v1(self, message: ListenV1SocketClientResponse):
-        """Processar mensagens do modo V1"""
-        msg_type = getattr(message, "type", "Unknown")
-
-        # Evento SpeechStarted (VAD)
-        if msg_type == "SpeechStarted":
-            print("🗣️  [Falando...]", end="", flush=True)
-            self._transcript_start_time = asyncio.get_event_loop().time()
-
-        # Evento UtteranceEnd (apenas se habilitado)
-        elif msg_type == "UtteranceEnd":
-            print("\r✅ [Fim de fala detectado!]")
-            if self._current_transcript:
-                self._process_final_transcript()
+    def _emit(self, s: str):
+        """
+        Emitir texto no terminal sem bloquear a thread do websocket.
 
-        # Resultados de transcrição
-        elif hasattr(message, 'channel') and message.channel:
-            alternatives = message.channel.alternatives
-            if not alternatives or not alternatives[0]:
+        Os handlers de mensagem rodam na thread de leitura do SDK; escrever
+        no terminal ali atrasa a recepção das próximas mensagens. Com um
+        event loop disponível, a escrita é agendada via call_soon_threadsafe
+        e a seção crítica do handler vira só a mutação de estado.
+        """
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(_fast_print, s)
                 return
+            except RuntimeError:
+                pass
+        _fast_print(s)
 
-            transcript = alternatives[0].transcript
-            if not transcript:
-                return
+    @staticmethod
+    def _classe_por_evento(message) -> bool:
+        """
+        A classe da mensagem é específica do evento?
+
+        Só é seguro memoizar o handler por type object quando a própria
+        classe carrega o discriminador `type` como constante (uma classe
+        por evento). Se `type` só existe na instância, o SDK usa um wrapper
+        único e o despacho por string continua valendo.
+        """
+        return isinstance(getattr(type(message), "type", None), str)
+
+    def _on_message_v1(self, message: ListenV1SocketClientResponse):
+        """Processar mensagens do modo V1 (despacho por tipo, com memo)"""
+        handler = self._v1_type_memo.get(type(message))
+        if handler is None:
+            handler = (
+                self._V1_HANDLERS.get(getattr(message, "type", ""))
+                or DeepgramVoiceAssistant._h_v1_results
+            )
+            if self._classe_por_evento(message):
+                self._v1_type_memo[type(message)] = handler
+        handler(self, message)
+
+    def _h_v1_speech_started(self, message):
+        """Evento SpeechStarted (VAD)"""
+        self._emit(_M.FALANDO)
+        # monotonic_ns: uma chamada C direta, sem passar pelo acessor
+        # (deprecado) asyncio.get_event_loop() dentro de callback síncrono
+        self._transcript_start_time = time.monotonic_ns()
+
+    def _h_v1_utterance_end(self, message):
+        """Evento UtteranceEnd (apenas se habilitado)"""
+        print("\r✅ [Fim de fala detectado!]")
+        if self._current_transcript:
+            self._process_final_transcript()
+
+    def _h_v1_results(self, message):
+        """Resultados de transcrição (parciais e finais)"""
+        try:
+            alternatives = message.channel.alternatives
+        except AttributeError:
+            return
+        if not alternatives or not alternatives[0]:
+            return
+
+        transcript = alternatives[0].transcript
+        if not transcript:
+            return
 
-            is_final = getattr(message, 'is_final', False)
-            speech_final = getattr(message, 'speech_final', False)
+        is_final = getattr(message, 'is_final', False)
+        speech_final = getattr(message, 'speech_final', False)
+        self._last_is_final = bool(is_final)
 
-            # Transcrição parcial
-            if not is_final:
-                print(f"\r🎤 [Parcial]: {transcript}", end="", flush=True)
+        # Transcrição parcial
+        if not is_final:
+            self._emit(_M.PARCIAL + transcript.encode("utf-8"))
 
-            # Transcrição finalizada (speech_final)
-            elif is_final and speech_final:
-                print(f"\r📝 [Final]: {transcript}")
-                self._current_transcript = transcript
+        # Transcrição finalizada (speech_final)
+        elif is_final and speech_final:
+            self._emit(_M.FINAL + transcript.encode("utf-8") + _M.NL)
+            self._current_transcript = transcript
 
-                if self.detection_method == DetectionMethod.ENDPOINTING:
-                    # No modo endpointing, speech_final indica fim
-                    self._process_final_transcript()
-            else:
-                # is_final mas não speech_final
-                self._current_transcript = transcript
+            if self.detection_method == DetectionMethod.ENDPOINTING:
+                # No modo endpointing, speech_final indica fim
+                self._process_final_transcript()
+        else:
+            # is_final mas não speech_final
+            self._current_transcript = transcript
+
+    # Tabela de despacho: um lookup O(1) em vez da cadeia de comparações
+    _V1_HANDLERS = {
+        "SpeechStarted": _h_v1_speech_started,
+        "UtteranceEnd": _h_v1_utterance_end,
+        "Results": _h_v1_results,
+    }
 
     # ========================================================================
     # MODO V2: Voice Agent API
@@ -215,6 +394,7 @@ class DeepgramVoiceAssistant:
         print(f"🎤 Iniciando Deepgram V2 (Voice Agent)...")
         print(f"⚙️  Eager EOT: {eager_eot_threshold}, EOT: {eot_threshold}")
 
+        self._loop = asyncio.get_running_loop()
         self.client = AsyncDeepgramClient(self.api_key)
 
         # Conectar com parâmetros de detecção de turno
@@ -239,32 +419,49 @@ class DeepgramVoiceAssistant:
         await self._start_microphone_async()
 
     def _on_message_v2(self, message: ListenV2SocketClientResponse):
-        """Processar mensagens do modo V2"""
-        msg_type = getattr(message, "type", "Unknown")
-
-        if msg_type == "Welcome":
-            print("👋 Bem-vindo ao Voice Agent!")
-
-        elif msg_type == "UserStartedSpeaking":
-            print("🗣️  [Você está falando...]", end="", flush=True)
-
-        elif msg_type == "ConversationText":
-            # Texto completo da conversa
-            if hasattr(message, 'content'):
-                print(f"\r📝 [Transcrição]: {message.content}")
-                self._current_transcript = message.content
-
-        elif msg_type == "AgentThinking":
-            # Agente está processando (usuário parou de falar)
-            print("\r🤔 [Processando...]")
-            if self._current_transcript:
-                self._process_final_transcript()
-
-        elif msg_type == "AgentStartedSpeaking":
-            print("🔊 [Agente respondendo...]")
-
-        elif msg_type == "AgentAudioDone":
-            print("✅ [Resposta finalizada]")
+        """Processar mensagens do modo V2 (despacho por tipo, com memo)"""
+        handler = self._v2_type_memo.get(type(message))
+        if handler is None:
+            handler = self._V2_HANDLERS.get(getattr(message, "type", ""))
+            if handler is None:
+                return
+            if self._classe_por_evento(message):
+                self._v2_type_memo[type(message)] = handler
+        handler(self, message)
+
+    def _h_v2_welcome(self, message):
+        print("👋 Bem-vindo ao Voice Agent!")
+
+    def _h_v2_user_started(self, message):
+        self._emit(_M.VOCE_FALANDO)
+
+    def _h_v2_conversation(self, message):
+        """Texto completo da conversa"""
+        content = getattr(message, 'content', None)
+        if content is not None:
+            self._emit(_M.TRANSCRICAO + content.encode("utf-8") + _M.NL)
+            self._current_transcript = content
+
+    def _h_v2_thinking(self, message):
+        """Agente está processando (usuário parou de falar)"""
+        print("\r🤔 [Processando...]")
+        if self._current_transcript:
+            self._process_final_transcript()
+
+    def _h_v2_agent_speaking(self, message):
+        print("🔊 [Agente respondendo...]")
+
+    def _h_v2_audio_done(self, message):
+        print("✅ [Resposta finalizada]")
+
+    _V2_HANDLERS = {
+        "Welcome": _h_v2_welcome,
+        "UserStartedSpeaking": _h_v2_user_started,
+        "ConversationText": _h_v2_conversation,
+        "AgentThinking": _h_v2_thinking,
+        "AgentStartedSpeaking": _h_v2_agent_speaking,
+        "AgentAudioDone": _h_v2_audio_done,
+    }
 
     # ========================================================================
     # MÉTODOS UTILITÁRIOS
@@ -275,11 +472,16 @@ class DeepgramVoiceAssistant:
         if not self._current_transcript:
             return
 
+        if self._transcript_start_time is not None:
+            duration = (time.monotonic_ns() - self._transcript_start_time) / 1e9
+        else:
+            duration = 0.0
+
         result = TranscriptionResult(
             text=self._current_transcript.strip(),
             is_final=True,
             confidence=0.95,  # Deepgram não expõe facilmente
-            duration=0.0
+            duration=duration
         )
 
         print(f"\n🎯 COMANDO FINALIZADO: {result.text}")
@@ -290,21 +492,181 @@ class DeepgramVoiceAssistant:
 
         # Limpar para próximo comando
         self._current_transcript = ""
+        self._last_is_final = False
+        self._silence_ms = 0
+        self._finalize_enviado = False
+
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """
+        Callback do PortAudio (thread de áudio).
+
+        Copia o frame capturado para o ring buffer via slice de memoryview
+        (sem alocação) e acorda o consumidor. Nunca bloqueia: se o consumidor
+        estiver atrasado, os bytes mais antigos são sobrescritos.
+        """
+        size = len(self._ring)
+        n = len(in_data)
+        pos = self._ring_tail % size
+        end = pos + n
+
+        if end <= size:
+            self._ring[pos:end] = in_data
+        else:
+            corte = size - pos
+            self._ring[pos:] = in_data[:corte]
+            self._ring[:end - size] = in_data[corte:]
+
+        self._ring_tail += n
+        self._ring_event.set()
+        return (None, pyaudio.paContinue)
+
+    def _vad_update(self, data: bytes):
+        """
+        Atualizar o contador de silêncio local e disparar Finalize cedo.
+
+        Roda sobre os bytes drenados do ring em frames de 30 ms. Quando o
+        silêncio local passa de VAD_SILENCE_FLUSH_MS e o último transcript
+        do servidor já veio com is_final, envia um Finalize para o Deepgram
+        liberar o resultado sem esperar o endpointing completo. O caminho
+        UtteranceEnd continua como fallback.
+        """
+        if self._vad is None:
+            return
+
+        frame_bytes = self.VAD_FRAME_BYTES
+        for inicio in range(0, len(data) - frame_bytes + 1, frame_bytes):
+            frame = data[inicio:inicio + frame_bytes]
+            try:
+                com_fala = self._vad.is_speech(frame, self.RATE)
+            except Exception:
+                return
+            if com_fala:
+                self._silence_ms = 0
+                self._finalize_enviado = False
+            else:
+                self._silence_ms += 30
+
+        if (
+            self._silence_ms >= self.VAD_SILENCE_FLUSH_MS
+            and self._last_is_final
+            and not self._finalize_enviado
+        ):
+            try:
+                self.connection.send_control({"type": "Finalize"})
+                self._finalize_enviado = True
+            except Exception:
+                # SDK sem canal de controle exposto: segue só com endpointing
+                self._vad = None
+
+    def _bind_pa_read(self):
+        """
+        Tentar expor Pa_ReadStream via ctypes para leitura sem alocação.
+
+        Quando disponível, `_read_chunk` lê direto para um buffer int16
+        preallocado, evitando o `bytes` novo que `stream.read` aloca a cada
+        chunk. Qualquer falha (lib ausente, ponteiro interno inacessível)
+        mantém o fallback para `stream.read`.
+        """
+        self._pa_lib = None
+        self._pa_stream_ptr = None
+        try:
+            lib_path = ctypes.util.find_library("portaudio")
+            pa = ctypes.CDLL(lib_path or "libportaudio.so.2")
+            pa.Pa_ReadStream.argtypes = [
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_ulong,
+            ]
+            pa.Pa_ReadStream.restype = ctypes.c_int
+
+            # Ponteiro interno do PyAudio; nem toda versão o expõe como int
+            raw = getattr(self.stream, "_stream", None)
+            ptr = getattr(raw, "pa_stream", None) or getattr(raw, "value", None)
+            if not isinstance(ptr, int):
+                return
+
+            self._audio_buf = (ctypes.c_int16 * self.CHUNK)()
+            self._pa_lib = pa
+            self._pa_stream_ptr = ptr
+        except (OSError, AttributeError):
+            pass
+
+    def _read_chunk(self) -> bytes:
+        """Ler um chunk do microfone (caminho ctypes ou fallback PyAudio)"""
+        if self._pa_lib is not None:
+            rc = self._pa_lib.Pa_ReadStream(
+                self._pa_stream_ptr, self._audio_buf, self.CHUNK
+            )
+            if rc == 0:
+                return memoryview(self._audio_buf).cast("B")
+            # Erro de leitura (overflow etc.): desistir do caminho ctypes
+            self._pa_lib = None
+        return self.stream.read(self.CHUNK, exception_on_overflow=False)
+
+    def _media_v1(self, data) -> ListenV1MediaMessage:
+        """Obter um wrapper V1 do pool (ou alocar, se a classe for imutável)."""
+        if self._msg_pool_ok:
+            msg = self._msg_pool_v1[self._msg_idx & 3]
+            self._msg_idx += 1
+            try:
+                msg.data = data
+                return msg
+            except (AttributeError, TypeError, ValueError):
+                self._msg_pool_ok = False
+        return ListenV1MediaMessage(data)
+
+    def _media_v2(self, data) -> ListenV2MediaMessage:
+        """Obter um wrapper V2 do pool (ou alocar, se a classe for imutável)."""
+        if self._msg_pool_ok:
+            msg = self._msg_pool_v2[self._msg_idx & 3]
+            self._msg_idx += 1
+            try:
+                msg.data = data
+                return msg
+            except (AttributeError, TypeError, ValueError):
+                self._msg_pool_ok = False
+        return ListenV2MediaMessage(data=data)
+
+    def _drain_ring(self) -> bytes:
+        """Drenar todos os bytes disponíveis do ring buffer em uma única fatia."""
+        size = len(self._ring)
+        head, tail = self._ring_head, self._ring_tail
+
+        disponivel = tail - head
+        if disponivel <= 0:
+            return b""
+        if disponivel > size:
+            # Consumidor atrasado: descartar o que foi sobrescrito
+            head = tail - size
+            disponivel = size
+
+        pos = head % size
+        end = pos + disponivel
+        if end <= size:
+            data = bytes(self._ring[pos:end])
+        else:
+            data = bytes(self._ring[pos:]) + bytes(self._ring[:end - size])
+
+        self._ring_head = tail
+        return data
 
     def _start_microphone(self):
-        """Iniciar captura do microfone (síncrono)"""
-        FORMAT = pyaudio.paInt16
-        CHANNELS = 1
-        RATE = 16000
-        CHUNK = 1024
+        """
+        Iniciar captura do microfone (síncrono).
 
+        Usa a API de callback do PyAudio: o PortAudio empurra frames para o
+        ring buffer em sua própria thread, enquanto este loop apenas drena o
+        buffer e envia lotes para o websocket — captura e envio ficam
+        desacoplados, sem `stream.read` bloqueante no caminho quente.
+        """
         self.audio = pyaudio.PyAudio()
         self.stream = self.audio.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RATE,
+            format=self.FORMAT,
+            channels=self.CHANNELS,
+            rate=self.RATE,
             input=True,
-            frames_per_buffer=CHUNK
+            frames_per_buffer=self.CHUNK,
+            stream_callback=self._pa_callback
         )
 
         print("🎤 Escutando... Pressione Ctrl+C para parar\n")
@@ -312,8 +674,15 @@ class DeepgramVoiceAssistant:
         try:
             while self.is_listening:
                 try:
-                    data = self.stream.read(CHUNK, exception_on_overflow=False)
-                    self.connection.send_media(ListenV1MediaMessage(data))
+                    if not self._ring_event.wait(timeout=0.5):
+                        continue
+                    self._ring_event.clear()
+
+                    data = self._drain_ring()
+                    if data:
+                        # Um único send_media com tudo que acumulou no ring
+                        self.connection.send_media(self._media_v1(data))
+                        self._vad_update(data)
                 except Exception as e:
                     print(f"\n⚠️  Erro no áudio: {e}")
                     break
@@ -323,29 +692,46 @@ class DeepgramVoiceAssistant:
             self.stop()
 
     async def _start_microphone_async(self):
-        """Iniciar captura do microfone (assíncrono)"""
-        FORMAT = pyaudio.paInt16
-        CHANNELS = 1
-        RATE = 16000
-        CHUNK = 1024
+        """
+        Iniciar captura do microfone (assíncrono).
 
+        Os chunks de 64 ms do PyAudio são coalescidos em um buffer de
+        transmissão e enviados em frames websocket de ~128 ms, cortando o
+        overhead de framing WS/TLS e os wakeups do event loop pela metade.
+        """
         self.audio = pyaudio.PyAudio()
         self.stream = self.audio.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RATE,
+            format=self.FORMAT,
+            channels=self.CHANNELS,
+            rate=self.RATE,
             input=True,
-            frames_per_buffer=CHUNK
+            frames_per_buffer=self.CHUNK
         )
 
         print("🎤 Escutando... Pressione Ctrl+C para parar\n")
 
+        self._bind_pa_read()
+        loop = asyncio.get_running_loop()
+        tx_buf = bytearray()
+        last_flush = loop.time()
+
         try:
             while self.is_listening:
                 try:
-                    data = self.stream.read(CHUNK, exception_on_overflow=False)
-                    await self.connection.send_media(ListenV2MediaMessage(data=data))
-                    await asyncio.sleep(0.001)
+                    # A leitura bloqueia ~64 ms no ritmo do clock de áudio;
+                    # no executor ela não trava o event loop enquanto espera
+                    data = await loop.run_in_executor(None, self._read_chunk)
+                    tx_buf += data
+
+                    now = loop.time()
+                    if len(tx_buf) >= self.TX_FLUSH_BYTES or (
+                        tx_buf and now - last_flush >= self.TX_FLUSH_IDLE_S
+                    ):
+                        await self.connection.send_media(
+                            self._media_v2(bytes(tx_buf))
+                        )
+                        tx_buf.clear()
+                        last_flush = now
                 except Exception as e:
                     print(f"\n⚠️  Erro no áudio: {e}")
                     break
@@ -402,7 +788,6 @@ class DeepgramVoiceAssistant:
             self.audio.terminate()
 
         if self.connection:
-            from deepgram.extensions.types.sockets import ListenV2ControlMessage
             await self.connection.send_control(
                 ListenV2ControlMessage(type="CloseStream")
             )
@@ -414,6 +799,31 @@ class DeepgramVoiceAssistant:
 # EXEMPLOS DE USO
 # ========================================================================
 
+# Matcher compilado uma única vez: todas as palavras-chave são encontradas
+# em uma única passada do motor de regex (C), em vez de um scan completo
+# do texto por palavra-chave com `in`.
+_KEYWORD_RE = re.compile(r"horas|nome|seu|para")
+
+
+def _intent_horas(resultado: TranscriptionResult):
+    from datetime import datetime
+    hora = datetime.now().strftime("%H:%M")
+    print(f"🕐 Agora são {hora}")
+
+
+def _intent_nome(resultado: TranscriptionResult):
+    print("🤖 Meu nome é Nero, seu assistente de voz!")
+
+
+def _intent_parar(resultado: TranscriptionResult):
+    print("👋 Até logo!")
+    assistant.stop()
+
+
+def _intent_desconhecido(resultado: TranscriptionResult):
+    print("❓ Não entendi o comando")
+
+
 def exemplo_callback(resultado: TranscriptionResult):
     """
     Exemplo de callback para processar comando.
@@ -422,23 +832,17 @@ def exemplo_callback(resultado: TranscriptionResult):
     """
     print(f"\n💭 Processando comando: '{resultado.text}'")
 
-    # Exemplo simples de comandos
-    texto_lower = resultado.text.lower()
-
-    if "horas" in texto_lower:
-        from datetime import datetime
-        hora = datetime.now().strftime("%H:%M")
-        print(f"🕐 Agora são {hora}")
-
-    elif "nome" in texto_lower and "seu" in texto_lower:
-        print("🤖 Meu nome é Nero, seu assistente de voz!")
-
-    elif "para" in texto_lower:
-        print("👋 Até logo!")
-        assistant.stop()
+    # Uma passada pelo texto coleta todas as palavras-chave presentes
+    achados = set(_KEYWORD_RE.findall(resultado.text.lower()))
 
+    if "horas" in achados:
+        _intent_horas(resultado)
+    elif "nome" in achados and "seu" in achados:
+        _intent_nome(resultado)
+    elif "para" in achados:
+        _intent_parar(resultado)
     else:
-        print("❓ Não entendi o comando")
+        _intent_desconhecido(resultado)
 
 
 def exemplo_v1_endpointing():
@@ -497,6 +901,31 @@ async def exemplo_v2_voice_agent():
 # MAIN
 # ========================================================================
 
+def _instalar_event_loop_rapido():
+    """
+    Trocar o event loop padrão por uma implementação mais rápida (Linux).
+
+    Tenta uringcore (io_uring, sem syscalls de readiness no caminho quente),
+    depois uvloop (libuv); se nenhum estiver instalado, mantém o loop padrão.
+    """
+    import sys as _sys
+    if _sys.platform != "linux":
+        return
+
+    try:
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        return
+    except ImportError:
+        pass
+
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
 if __name__ == "__main__":
     import sys
 
@@ -521,6 +950,7 @@ Escolha o modo:
     elif escolha == "2":
         exemplo_v1_utterance_end()
     elif escolha == "3":
+        _instalar_event_loop_rapido()
         asyncio.run(exemplo_v2_voice_agent())
     else:
         print("❌ Escolha inválida")
@@ -0,0 +1,10 @@
+"""
+Módulos do NERO Voice Assistant - Nível 1 (Comando Simples)
+
+- logger: saída colorida no terminal (Rich)
+- stt_fraco: reconhecimento local de wake word (Sphinx)
+- stt_forte: transcrição de alta qualidade (Deepgram)
+- tts: síntese de voz (Cartesia)
+- http: cliente httpx compartilhado (HTTP/2 + pool)
+- agent_handler: processamento com Claude Agent SDK
+"""
@@ -0,0 +1,353 @@
+"""
+Agent Handler - Processamento com Claude Agent SDK
+==================================================
+
+Recebe a transcrição do comando de voz, envia ao Claude via Agent SDK e
+devolve a resposta em texto. Um hook de Stop gera um resumo curto da
+resposta e o encaminha para o TTS falar.
+
+O módulo funciona mesmo sem o claude-agent-sdk instalado: nesse caso
+`processar_prompt` retorna um erro amigável em vez de quebrar o assistente.
+"""
+
+import asyncio
+import re
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .logger import NeroLogger
+
+# Import único do SDK no carregamento do módulo: evita pagar a maquinaria
+# de import (e a validação das options) a cada turno do usuário.
+try:
+    from claude_agent_sdk import query, ClaudeAgentOptions, HookMatcher
+    _SDK_OK = True
+except ImportError:
+    query = None
+    ClaudeAgentOptions = None
+    HookMatcher = None
+    _SDK_OK = False
+
+# Tokenizador BPE nativo (Rust) para contagem exata de tokens; sem ele,
+# caímos na estimativa antiga por contagem de palavras.
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENC = None
+
+# Preços aproximados (USD por milhão de tokens) usados na estimativa de custo
+PRECO_INPUT_POR_MTOK = 3.0
+PRECO_OUTPUT_POR_MTOK = 15.0
+
+# Fronteira de sentença para o streaming incremental de TTS
+_SENT_BOUNDARY = re.compile(r"[.!?…]\s")
+
+SYSTEM_PROMPT = """Você é NERO, um assistente de voz em português brasileiro.
+
+Regras:
+- Responda sempre em português do Brasil
+- Seja direto e conciso: a resposta será falada em voz alta
+- Evite listas longas, código ou formatação Markdown
+- Se não souber a resposta, diga isso claramente
+"""
+
+
+class AgentHandler:
+    """
+    Integração do NERO com o Claude Agent SDK.
+
+    Uso:
+        handler = AgentHandler()
+        handler.set_tts_callback(tts_callback)
+        resultado = await handler.processar_prompt("que horas são?")
+    """
+
+    def __init__(self, logger: Optional[NeroLogger] = None):
+        """
+        Inicializar handler do agente.
+
+        Args:
+            logger: Logger compartilhado (cria um próprio se omitido)
+        """
+        self.logger = logger or NeroLogger()
+        self._tts_callback: Optional[Callable] = None
+
+        # Fila única de TTS com um consumidor de vida longa: serializa a
+        # fala (sem áudios sobrepostos) e evita criar uma task por hook.
+        self._tts_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+        self._tts_consumer: Optional[asyncio.Task] = None
+
+        # Streaming de sentenças: buffer parcial e flag do turno corrente
+        self._sentence_buf = ""
+        self._streamed_neste_turno = False
+
+        # Métricas acumuladas da sessão
+        self.total_interacoes = 0
+        self.total_custo = 0.0
+
+        # Hook e options construídos uma única vez por instância: o hook
+        # fecha sobre self, e as options são reutilizadas em todos os turnos.
+        if _SDK_OK:
+            self._hook = self._criar_hook_finalizacao_tts()
+            self._options = ClaudeAgentOptions(
+                system_prompt=SYSTEM_PROMPT,
+                max_turns=1,
+                hooks={"Stop": [self._hook]},
+            )
+        else:
+            self._hook = None
+            self._options = None
+
+    def set_tts_callback(self, callback: Callable):
+        """
+        Registrar callback assíncrono que recebe o resumo para o TTS falar.
+
+        Args:
+            callback: Coroutine function que recebe o texto do resumo
+        """
+        self._tts_callback = callback
+        self._garantir_consumidor_tts()
+
+    def _garantir_consumidor_tts(self):
+        """Iniciar o consumidor da fila de TTS, se ainda não estiver rodando"""
+        if self._tts_consumer is not None and not self._tts_consumer.done():
+            return
+        try:
+            self._tts_consumer = asyncio.create_task(self._drain_tts())
+        except RuntimeError:
+            # Sem event loop rodando (ex.: setup síncrono em testes);
+            # o consumidor será criado no primeiro hook dentro do loop
+            self._tts_consumer = None
+
+    async def _drain_tts(self):
+        """Consumir a fila de resumos e falar um por vez"""
+        while True:
+            texto = await self._tts_queue.get()
+            try:
+                if self._tts_callback is not None:
+                    await self._tts_callback(texto)
+            except Exception as e:
+                self.logger.erro(f"Falha no TTS: {e}")
+            finally:
+                self._tts_queue.task_done()
+
+    def _enfileirar_tts(self, texto: str):
+        """Colocar um trecho na fila de TTS com backpressure drop-oldest"""
+        self._garantir_consumidor_tts()
+        try:
+            self._tts_queue.put_nowait(texto)
+        except asyncio.QueueFull:
+            self._tts_queue.get_nowait()
+            self._tts_queue.put_nowait(texto)
+
+    def _stream_para_tts(self, delta: str):
+        """
+        Acumular texto do agente e enviar sentenças completas ao TTS.
+
+        Cada fronteira `[.!?…] ` fecha uma sentença, que vai imediatamente
+        para a fila — o TTS começa a falar enquanto o agente ainda gera os
+        tokens finais da resposta.
+        """
+        if self._tts_callback is None:
+            return
+
+        self._sentence_buf += delta
+        while True:
+            m = _SENT_BOUNDARY.search(self._sentence_buf)
+            if m is None:
+                break
+            sentenca = self._sentence_buf[: m.end()].strip()
+            self._sentence_buf = self._sentence_buf[m.end():]
+            if sentenca:
+                self._enfileirar_tts(sentenca)
+                self._streamed_neste_turno = True
+
+    async def close(self):
+        """Encerrar o consumidor de TTS, drenando o que estiver pendente"""
+        if self._tts_consumer is None:
+            return
+        await self._tts_queue.join()
+        self._tts_consumer.cancel()
+        try:
+            await self._tts_consumer
+        except asyncio.CancelledError:
+            pass
+        self._tts_consumer = None
+
+    async def processar_prompt(self, transcricao: str) -> Dict[str, Any]:
+        """
+        Enviar a transcrição ao Claude e retornar a resposta.
+
+        Args:
+            transcricao: Comando de voz já transcrito
+
+        Returns:
+            Dict com sucesso, texto, custo estimado e contagem de tokens
+        """
+        if not _SDK_OK:
+            self.logger.erro("claude-agent-sdk não instalado")
+            return {
+                "sucesso": False,
+                "texto": "O Claude Agent SDK não está disponível.",
+                "erro": "claude-agent-sdk não instalado",
+            }
+
+        self.logger.agent(f"Processando: '{transcricao}'")
+
+        # Estado do streaming de sentenças deste turno
+        self._sentence_buf = ""
+        self._streamed_neste_turno = False
+
+        resultado_texto = ""
+        try:
+            async for message in query(prompt=transcricao, options=self._options):
+                # Acumular blocos de texto das mensagens do assistente
+                for block in getattr(message, "content", []) or []:
+                    texto_bloco = getattr(block, "text", None)
+                    if texto_bloco:
+                        resultado_texto += texto_bloco
+                        # Sentenças completas vão para o TTS imediatamente,
+                        # sobrepondo síntese de voz com a geração do agente
+                        self._stream_para_tts(texto_bloco)
+        except Exception as e:
+            self.logger.erro(f"Falha ao consultar o agente: {e}")
+            return {"sucesso": False, "texto": "", "erro": str(e)}
+
+        # Flush do resto (só se já falamos alguma sentença neste turno;
+        # respostas curtas sem fronteira ficam por conta do hook de Stop)
+        if self._streamed_neste_turno and self._sentence_buf.strip():
+            self._enfileirar_tts(self._sentence_buf.strip())
+            self._sentence_buf = ""
+
+        return self._contabilizar(transcricao, resultado_texto)
+
+    async def processar_prompt_stream(
+        self, transcricao: str
+    ) -> AsyncIterator[str]:
+        """
+        Enviar a transcrição ao Claude e emitir os blocos de texto
+        conforme chegam (async generator).
+
+        O chamador pode sintetizar/falar cada trecho enquanto o agente
+        ainda gera o restante; as métricas da sessão são contabilizadas
+        ao final do stream.
+
+        Args:
+            transcricao: Comando de voz já transcrito
+
+        Yields:
+            Blocos de texto da resposta, na ordem de chegada
+        """
+        if not _SDK_OK:
+            self.logger.erro("claude-agent-sdk não instalado")
+            yield "O Claude Agent SDK não está disponível."
+            return
+
+        self.logger.agent(f"Processando: '{transcricao}'")
+
+        resultado_texto = ""
+        async for message in query(prompt=transcricao, options=self._options):
+            for block in getattr(message, "content", []) or []:
+                texto_bloco = getattr(block, "text", None)
+                if texto_bloco:
+                    resultado_texto += texto_bloco
+                    yield texto_bloco
+
+        self._contabilizar(transcricao, resultado_texto)
+
+    def _contabilizar(
+        self, transcricao: str, resultado_texto: str
+    ) -> Dict[str, Any]:
+        """Contabilizar tokens/custo do turno e montar o dict de resultado"""
+        if _ENC is not None:
+            # Contagem exata, em lote, pelo tokenizador nativo
+            input_tokens, output_tokens = (
+                len(toks)
+                for toks in _ENC.encode_ordinary_batch(
+                    [transcricao, resultado_texto]
+                )
+            )
+        else:
+            # Estimativa por contagem de palavras (~1.3 tok/palavra)
+            input_tokens = len(transcricao.split()) * 1.3
+            output_tokens = len(resultado_texto.split()) * 1.3
+        custo_estimado = (
+            input_tokens * PRECO_INPUT_POR_MTOK
+            + output_tokens * PRECO_OUTPUT_POR_MTOK
+        ) / 1_000_000
+
+        self.total_interacoes += 1
+        self.total_custo += custo_estimado
+
+        self.logger.agent(
+            f"Resposta recebida ({len(resultado_texto)} chars, "
+            f"~${custo_estimado:.6f})"
+        )
+
+        return {
+            "sucesso": True,
+            "texto": resultado_texto,
+            "custo": custo_estimado,
+            "input_tokens": int(input_tokens),
+            "output_tokens": int(output_tokens),
+        }
+
+    def _criar_hook_finalizacao_tts(self):
+        """
+        Criar o hook de Stop que dispara o TTS com um resumo da resposta.
+
+        Returns:
+            HookMatcher configurado para o evento Stop
+        """
+        async def _on_stop(context, *args):
+            final_response = ""
+            msgs = getattr(context, "messages", None) or ()
+            if msgs:
+                # Caso comum: a última mensagem É a do assistente
+                last = msgs[-1]
+                if getattr(last, "role", None) == "assistant":
+                    final_response = getattr(last, "content", "") or ""
+                else:
+                    for message in reversed(msgs):
+                        if getattr(message, "role", None) == "assistant":
+                            final_response = getattr(message, "content", "") or ""
+                            break
+
+            # Se o streaming de sentenças já falou este turno, não repetir
+            if self._streamed_neste_turno:
+                return {}
+
+            resumo_tts = self._gerar_resumo_tts(final_response)
+            if self._tts_callback and resumo_tts:
+                self._enfileirar_tts(resumo_tts)
+            return {}
+
+        return HookMatcher(matcher=None, hooks=[_on_stop])
+
+    def _gerar_resumo_tts(self, texto: str, max_chars: int = 200) -> str:
+        """
+        Resumir a resposta para o TTS (corte em limite de palavra).
+
+        O caso comum (resposta curta) retorna o texto intacto sem alocar
+        nada; respostas longas são cortadas no último espaço dentro da
+        janela [max_chars - 40, max_chars] com um único rfind.
+
+        Args:
+            texto: Resposta completa do agente
+            max_chars: Tamanho máximo do resumo falado
+
+        Returns:
+            Texto pronto para o TTS
+        """
+        if len(texto) <= max_chars:
+            return texto
+
+        corte = texto.rfind(" ", max_chars - 40, max_chars)
+        return texto[: corte if corte != -1 else max_chars] + "..."
+
+    def resumo_sessao(self) -> Dict[str, Any]:
+        """Resumo das métricas acumuladas da sessão"""
+        return {
+            "interacoes": self.total_interacoes,
+            "custo_total": self.total_custo,
+        }
@@ -0,0 +1,49 @@
+"""
+HTTP - Cliente httpx compartilhado
+==================================
+
+Um único AsyncClient com HTTP/2 e pool de conexões afinado, compartilhado
+entre Deepgram (STT Forte) e Cartesia (TTS): as requisições back-to-back
+do assistente reutilizam a mesma conexão TLS em vez de pagar handshake
+TCP+TLS a cada chamada (~20ms+ por request).
+
+Com HTTP/2 as requisições concorrentes (ex.: o gather do gerador de
+fixtures) são multiplexadas como streams de poucas conexões persistentes:
+o kernel processa as respostas em lote sobre os mesmos sockets, sem
+getaddrinfo nem setup TCP/TLS por requisição — o análogo, em httpx, do
+connector com pool e cache de DNS do aiohttp.
+
+A autenticação fica por requisição (cada API usa seu próprio esquema),
+então o cliente em si não carrega headers de Authorization.
+"""
+
+from typing import Optional
+
+import httpx
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Obter (criando sob demanda) o cliente HTTP compartilhado"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=60.0,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _shared_client
+
+
+async def close_shared_client():
+    """Fechar o cliente compartilhado (chamar uma vez, no cleanup)"""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
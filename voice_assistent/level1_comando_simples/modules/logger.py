@@ -0,0 +1,250 @@
+"""
+NERO Logger - Saída colorida no terminal
+========================================
+
+Logger simples baseado em Rich, com níveis específicos para cada estado
+do assistente (aguardando, gravando, processando, respondendo) além dos
+níveis tradicionais (info, sucesso, aviso, erro, debug).
+"""
+
+import queue
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+from rich.console import Console, Group
+from rich.text import Text
+
+_COLORS = {
+    "INFO": "cyan",
+    "SUCESSO": "green",
+    "AVISO": "yellow",
+    "ERRO": "red",
+    "DEBUG": "dim white",
+    "AGUARDANDO": "blue",
+    "GRAVANDO": "magenta",
+    "PROCESSANDO": "yellow",
+    "RESPONDENDO": "green",
+    "TTS": "bright_magenta",
+    "AGENT": "bright_cyan",
+    "STT": "bright_blue",
+}
+
+_EMOJIS = {
+    "INFO": "ℹ️ ",
+    "SUCESSO": "✅",
+    "AVISO": "⚠️ ",
+    "ERRO": "❌",
+    "DEBUG": "🔍",
+    "AGUARDANDO": "👂",
+    "GRAVANDO": "🎤",
+    "PROCESSANDO": "🤔",
+    "RESPONDENDO": "🔊",
+    "TTS": "🗣️ ",
+    "AGENT": "🤖",
+    "STT": "📝",
+}
+
+# (cor, emoji) combinados num único dict: um lookup por log em vez de dois
+_LEVEL_STYLE = {
+    lvl: (_COLORS.get(lvl, "white"), _EMOJIS.get(lvl, "•"))
+    for lvl in set(_COLORS) | set(_EMOJIS)
+}
+
+_BANNER = """
+╔═══════════════════════════════════════════════════════════╗
+║                                                           ║
+║     ███╗   ██╗███████╗██████╗  ██████╗                    ║
+║     ████╗  ██║██╔════╝██╔══██╗██╔═══██╗                   ║
+║     ██╔██╗ ██║█████╗  ██████╔╝██║   ██║                   ║
+║     ██║╚██╗██║██╔══╝  ██╔══██╗██║   ██║                   ║
+║     ██║ ╚████║███████╗██║  ██║╚██████╔╝                   ║
+║     ╚═╝  ╚═══╝╚══════╝╚═╝  ╚═╝ ╚═════╝                    ║
+║                                                           ║
+║     Assistente de Voz - Nível 1 (Comando Simples)         ║
+║     Wake word: "NERO OUVIR" · Enviar: "NERO ENVIAR"       ║
+║                                                           ║
+╚═══════════════════════════════════════════════════════════╝
+"""
+
+
+class NeroLogger:
+    """
+    Logger do NERO com cores e emojis por nível.
+
+    Cada estado do assistente tem seu próprio nível visual, facilitando
+    acompanhar a máquina de estados no terminal durante uma sessão.
+    """
+
+    # Vistas imutáveis: ninguém muda o estilo por acidente em runtime
+    COLORS = MappingProxyType(_COLORS)
+    EMOJIS = MappingProxyType(_EMOJIS)
+
+    def __init__(self, verbose: bool = False):
+        """
+        Inicializar logger.
+
+        Args:
+            verbose: Se True, mensagens DEBUG são exibidas
+        """
+        self.verbose = verbose
+        self._debug_enabled = verbose
+        self.console = Console()
+
+        # Prefixo "[NÍVEL] emoji " resolvido uma única vez por nível:
+        # o log() quente não paga lookups de COLORS/EMOJIS nem f-string
+        self._prefix_templates = {
+            level: (color, f"[{level}] {emoji} ")
+            for level, (color, emoji) in _LEVEL_STYLE.items()
+        }
+
+        # Escrita em stdout fora do caminho quente: log() só enfileira o
+        # Text pronto e retorna; uma thread daemon drena a fila em lotes e
+        # faz um único Console.print por lote. Quem loga nunca bloqueia no
+        # write travado de stdout.
+        # Timestamp formatado memoizado por segundo inteiro: dentro do
+        # mesmo segundo todas as linhas reusam a mesma string
+        self._ts_cache = (0, "")
+
+        self._log_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, daemon=True
+        )
+        self._flush_thread.start()
+
+    def _flush_loop(self):
+        """Drenar a fila de logs em lotes e imprimir (thread daemon)"""
+        while True:
+            batch = [self._log_q.get()]
+            while True:
+                try:
+                    batch.append(self._log_q.get_nowait())
+                except queue.Empty:
+                    break
+            if len(batch) == 1:
+                self.console.print(batch[0])
+            else:
+                self.console.print(Group(*batch))
+
+    def _get_timestamp(self) -> str:
+        """Timestamp HH:MM:SS da mensagem (cache por segundo)"""
+        now = int(time.time())
+        sec, s = self._ts_cache
+        if now != sec:
+            s = time.strftime("%H:%M:%S", time.localtime(now))
+            self._ts_cache = (now, s)
+        return s
+
+    def log(self, level: str, message: str, *args):
+        """
+        Registrar uma mensagem com o nível dado.
+
+        A formatação %-style é adiada: `log("STT", "Ouvi: '%s'", texto)` só
+        interpola depois que o nível passou pelo filtro, então chamadas DEBUG
+        com verbose=False não pagam nenhuma construção de string.
+
+        Args:
+            level: Nível da mensagem (INFO, ERRO, GRAVANDO, ...)
+            message: Texto da mensagem (ou template %-style)
+            *args: Argumentos para interpolação adiada no template
+        """
+        if level == "DEBUG":
+            if not self._debug_enabled:
+                return
+            # DEBUG é o canal mais volumoso e não precisa de cor: escrever
+            # direto em stderr evita todo o pipeline de renderização do Rich
+            if args:
+                message = message % args
+            sys.stderr.write(f"{self._get_timestamp()} [DEBUG] {message}\n")
+            return
+
+        if args:
+            message = message % args
+
+        color, prefix = self._prefix_templates.get(
+            level, ("white", f"[{level}] • ")
+        )
+
+        text = Text()
+        text.append(self._get_timestamp(), style="dim")
+        text.append(" ")
+        text.append(prefix, style=color)
+        text.append(message)
+
+        self._log_q.put(text)
+
+    # ------------------------------------------------------------------
+    # Níveis tradicionais
+    # ------------------------------------------------------------------
+
+    def info(self, message: str, *args):
+        """Informação geral"""
+        self.log("INFO", message, *args)
+
+    def sucesso(self, message: str, *args):
+        """Operação bem-sucedida"""
+        self.log("SUCESSO", message, *args)
+
+    def aviso(self, message: str, *args):
+        """Aviso não-fatal"""
+        self.log("AVISO", message, *args)
+
+    def erro(self, message: str, *args):
+        """Erro"""
+        self.log("ERRO", message, *args)
+
+    def debug(self, message: str, *args):
+        """
+        Detalhe de depuração (apenas com verbose=True).
+
+        Aceita template %-style com argumentos separados para que o caso
+        comum (verbose desligado) retorne antes de qualquer formatação.
+        """
+        if not self._debug_enabled:
+            return
+        self.log("DEBUG", message, *args)
+
+    # ------------------------------------------------------------------
+    # Níveis por estado do assistente
+    # ------------------------------------------------------------------
+
+    def aguardando(self, message: str, *args):
+        """Estado AGUARDANDO (escutando wake word)"""
+        self.log("AGUARDANDO", message, *args)
+
+    def gravando(self, message: str, *args):
+        """Estado GRAVANDO (capturando comando)"""
+        self.log("GRAVANDO", message, *args)
+
+    def processando(self, message: str, *args):
+        """Estado PROCESSANDO (agente pensando)"""
+        self.log("PROCESSANDO", message, *args)
+
+    def respondendo(self, message: str, *args):
+        """Estado RESPONDENDO (reproduzindo áudio)"""
+        self.log("RESPONDENDO", message, *args)
+
+    # ------------------------------------------------------------------
+    # Níveis por componente
+    # ------------------------------------------------------------------
+
+    def tts(self, message: str, *args):
+        """Eventos do módulo TTS (Cartesia)"""
+        self.log("TTS", message, *args)
+
+    def agent(self, message: str, *args):
+        """Eventos do Claude Agent SDK"""
+        self.log("AGENT", message, *args)
+
+    def stt(self, message: str, *args):
+        """Eventos dos módulos STT (Sphinx/Deepgram)"""
+        self.log("STT", message, *args)
+
+    # ------------------------------------------------------------------
+    # Banner
+    # ------------------------------------------------------------------
+
+    def print_banner(self):
+        """Exibir o banner de inicialização do NERO"""
+        self.console.print(_BANNER, style="bold cyan")
@@ -0,0 +1,274 @@
+"""
+STT Forte - Transcrição de alta qualidade com Deepgram
+======================================================
+
+Transcrição precisa do comando de voz via API REST do Deepgram (modelo
+nova-2, pt-BR). Complementa o STT Fraco: o Sphinx local só detecta as
+palavras de controle, e o áudio completo do comando vem para cá.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .http import get_shared_client
+from .logger import NeroLogger
+
+# orjson (Rust) decodifica as respostas multi-MB do nova-2 (timestamps e
+# confidences por palavra) 2-4x mais rápido que o json da stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# WebSocket streaming: resultados parciais chegam enquanto o usuário ainda
+# fala. Sem a lib `websockets`, caímos no streaming HTTP one-shot.
+try:
+    import websockets
+    _WS_OK = True
+except ImportError:
+    websockets = None
+    _WS_OK = False
+
+# Parâmetros fixos da API para pt-BR, compartilhados por todas as
+# requisições (o httpx só lê o mapping, então o compartilhamento é seguro)
+_DEEPGRAM_PARAMS = {
+    "model": "nova-2",
+    "language": "pt-BR",
+    "smart_format": "true",
+    "punctuate": "true",
+    "numerals": "true",
+}
+
+
+class STTForte:
+    """
+    Cliente Deepgram para transcrição do comando gravado.
+
+    Uso:
+        stt = STTForte()
+        transcricao = await stt.transcrever_audio_file(wav_bytes)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        logger: Optional[NeroLogger] = None,
+    ):
+        """
+        Inicializar o cliente Deepgram.
+
+        Args:
+            api_key: Chave da API (padrão: variável DEEPGRAM_API_KEY)
+            logger: Logger compartilhado (cria um próprio se omitido)
+        """
+        self.api_key = api_key or os.getenv("DEEPGRAM_API_KEY", "")
+        self.logger = logger or NeroLogger()
+        self.base_url = "https://api.deepgram.com/v1/listen"
+        self.ws_url = "wss://api.deepgram.com/v1/listen"
+
+        # Auth por requisição: o cliente HTTP (HTTP/2, pool com keepalive,
+        # retries) é o singleton compartilhado com o TTS em modules/http.py
+        self._headers = {"Authorization": f"Token {self.api_key}"}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartilhado (HTTP/2 + pool, ver modules/http.py)"""
+        return get_shared_client()
+
+    async def warmup(self):
+        """
+        Pré-aquecer a conexão com o Deepgram (DNS + TCP + TLS).
+
+        Disparado em background na inicialização, para que a primeira
+        transcrição real não pague o handshake.
+        """
+        client = self._get_client()
+        try:
+            await client.get(
+                "https://api.deepgram.com/v1/projects", headers=self._headers
+            )
+        except Exception:
+            # Warm-up é melhor esforço; falha aqui não é erro de operação
+            pass
+
+    def _build_params(self) -> Dict[str, str]:
+        """Parâmetros de query da API Deepgram para pt-BR (constante)"""
+        return _DEEPGRAM_PARAMS
+
+    async def transcrever_audio_file(
+        self, audio_data: bytes, content_type: str = "audio/wav"
+    ) -> str:
+        """
+        Transcrever um áudio completo (one-shot).
+
+        Args:
+            audio_data: Bytes do áudio (WAV por padrão)
+            content_type: MIME type do áudio enviado
+
+        Returns:
+            Transcrição em texto (string vazia em caso de erro)
+        """
+        if not self.api_key:
+            self.logger.erro("DEEPGRAM_API_KEY não configurada")
+            return ""
+
+        client = self._get_client()
+        try:
+            response = await client.post(
+                self.base_url,
+                params=self._build_params(),
+                content=audio_data,
+                headers={**self._headers, "Content-Type": content_type},
+            )
+        except httpx.HTTPError as e:
+            self.logger.erro(f"Falha na requisição ao Deepgram: {e}")
+            return ""
+
+        return self._extrair_transcricao(response)
+
+    def _extrair_transcricao(self, response: httpx.Response) -> str:
+        """Extrair o transcript de uma resposta da API Deepgram"""
+        if response.status_code != 200:
+            self.logger.erro(
+                f"Deepgram retornou {response.status_code}: {response.text[:200]}"
+            )
+            return ""
+
+        result = _loads(response.content)
+        try:
+            alternative = result["results"]["channels"][0]["alternatives"][0]
+        except (KeyError, IndexError):
+            self.logger.erro("Resposta do Deepgram sem transcrição")
+            return ""
+
+        transcript = alternative.get("transcript", "")
+        words = alternative.get("words", [])
+        self.logger.debug("Transcribed %d words", len(words))
+
+        return transcript
+
+    async def transcrever_em_tempo_real(
+        self,
+        audio_stream: Callable[[], AsyncIterator[Tuple[bytes, bool]]],
+        callback: Optional[Callable] = None,
+    ) -> str:
+        """
+        Transcrever áudio conforme os chunks chegam do gravador.
+
+        Args:
+            audio_stream: Async generator factory que produz (chunk, done)
+            callback: Opcional; recebe transcrições parciais
+
+        Returns:
+            Transcrição final completa
+        """
+        if not self.api_key:
+            self.logger.erro("DEEPGRAM_API_KEY não configurada")
+            return ""
+
+        if _WS_OK:
+            return await self._transcrever_via_websocket(audio_stream, callback)
+        return await self._transcrever_via_http(audio_stream)
+
+    async def _transcrever_via_websocket(
+        self,
+        audio_stream: Callable[[], AsyncIterator[Tuple[bytes, bool]]],
+        callback: Optional[Callable] = None,
+    ) -> str:
+        """
+        Streaming verdadeiro via WebSocket do Deepgram.
+
+        Duas corrotinas em paralelo: uma empurra os chunks de áudio pelo
+        socket conforme chegam do gravador, a outra lê os frames JSON de
+        resposta — parciais vão para o callback, finais são acumulados.
+        A primeira palavra transcrita chega em ~200ms, em vez de só após
+        a gravação inteira terminar.
+        """
+        params = self._build_params()
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        url = f"{self.ws_url}?{query}&interim_results=true"
+
+        finais = []
+        try:
+            async with websockets.connect(
+                url,
+                additional_headers={"Authorization": f"Token {self.api_key}"},
+            ) as ws:
+
+                async def _enviar():
+                    async for chunk, done in audio_stream():
+                        await ws.send(chunk)
+                        if done:
+                            break
+                    await ws.send(json.dumps({"type": "CloseStream"}))
+
+                async def _receber():
+                    async for frame in ws:
+                        data = _loads(frame)
+                        alts = data.get("channel", {}).get("alternatives", [])
+                        transcript = alts[0].get("transcript", "") if alts else ""
+                        if not transcript:
+                            continue
+                        if data.get("is_final"):
+                            finais.append(transcript)
+                            self.logger.debug("Final: '%s'", transcript)
+                        if callback is not None:
+                            resultado = callback(transcript)
+                            if asyncio.iscoroutine(resultado):
+                                await resultado
+
+                await asyncio.gather(_enviar(), _receber())
+        except Exception as e:
+            self.logger.erro(f"Falha no streaming WebSocket: {e}")
+            return ""
+
+        return " ".join(finais)
+
+    async def _transcrever_via_http(
+        self,
+        audio_stream: Callable[[], AsyncIterator[Tuple[bytes, bool]]],
+    ) -> str:
+        """Fallback sem `websockets`: upload HTTP em streaming, one-shot"""
+        # O corpo do POST é o próprio gerador de chunks: o httpx envia em
+        # Transfer-Encoding chunked enquanto a gravação ainda produz áudio,
+        # sem nunca materializar o payload completo em memória.
+        inicio = time.monotonic()
+        total = 0
+
+        async def _gen():
+            nonlocal total
+            async for chunk, done in audio_stream():
+                total += len(chunk)
+                yield chunk
+                if done:
+                    break
+
+        client = self._get_client()
+        try:
+            response = await client.post(
+                self.base_url,
+                params=self._build_params(),
+                content=_gen(),
+                headers={**self._headers, "Content-Type": "audio/wav"},
+            )
+        except httpx.HTTPError as e:
+            self.logger.erro(f"Falha na requisição ao Deepgram: {e}")
+            return ""
+
+        duracao = time.monotonic() - inicio
+        self.logger.debug("Streamed %d bytes in %.1fs", total, duracao)
+
+        return self._extrair_transcricao(response)
+
+    async def close(self):
+        """
+        Liberar recursos do STT Forte.
+
+        O cliente HTTP é o singleton compartilhado e é fechado uma única
+        vez pelo NeroAssistant.cleanup (modules.http.close_shared_client).
+        """
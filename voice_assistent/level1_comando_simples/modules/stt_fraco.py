@@ -0,0 +1,325 @@
+"""
+STT Fraco - Reconhecimento local com CMU Sphinx
+===============================================
+
+Reconhecimento de fala offline, rápido e impreciso — suficiente para
+detectar a wake word ("NERO OUVIR") e a palavra de parada ("NERO ENVIAR")
+sem gastar API. A transcrição de qualidade do comando em si fica a cargo
+do STT Forte (Deepgram).
+"""
+
+import asyncio
+import collections
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import speech_recognition as sr
+
+from .logger import NeroLogger
+
+# VAD em C (~1ms por chunk) para descartar silêncio antes do Sphinx
+# (~50ms por chunk); sem o pacote, todo chunk vai para o reconhecedor
+try:
+    import webrtcvad
+    _VAD_OK = True
+except ImportError:
+    webrtcvad = None
+    _VAD_OK = False
+
+# Resultado leve da thread de parada: namedtuple em vez de dict por evento
+_StopResult = collections.namedtuple("_StopResult", "detected palavra reason")
+
+
+class STTFraco:
+    """
+    Detector local de wake word e palavra de parada (Sphinx).
+
+    Uso:
+        stt = STTFraco()
+        resultado = await stt.detectar_wake_word(["NERO OUVIR", "NERO"])
+        if resultado["detected"]:
+            stt.aguardar_palavra_parada(["NERO ENVIAR"])
+    """
+
+    def __init__(self, logger: Optional[NeroLogger] = None):
+        """
+        Inicializar o reconhecedor local.
+
+        Args:
+            logger: Logger compartilhado (cria um próprio se omitido)
+        """
+        self.logger = logger or NeroLogger()
+        self.recognizer = sr.Recognizer()
+        self.recognizer.energy_threshold = 300
+        self.recognizer.dynamic_energy_threshold = True
+
+        # Canal por onde a thread de escuta da palavra de parada comunica o
+        # resultado de volta ao loop principal: append/popleft de deque são
+        # atômicos (lock-free no nível Python), e o Event dá semântica de
+        # wait(timeout) sem polling se o chamador precisar
+        self._stop_word_deque: collections.deque = collections.deque(maxlen=16)
+        self._stop_word_event = threading.Event()
+        self._stop_thread: Optional[threading.Thread] = None
+        self._stop_flag = threading.Event()
+
+        # Filtro de atividade de voz: chunk sem fala nem chega ao Sphinx
+        self._vad = webrtcvad.Vad(2) if _VAD_OK else None
+
+        # Pool de um worker para o Sphinx: o reconhecimento do chunk N roda
+        # em paralelo com o listen() do chunk N+1 (o Sphinx libera o GIL na
+        # extensão C), eliminando os buracos de captura durante o decode
+        self._recog_pool = ThreadPoolExecutor(max_workers=1)
+
+        # Cache do padrão compilado: (palavras, regex, mapa UPPER->original).
+        # Compilado lazy na primeira chamada e reusado enquanto a lista de
+        # palavras não mudar.
+        self._padrao_cache: tuple = ((), None, {})
+
+    def _padrao_de_palavras(self, palavras: List[str]):
+        """
+        Compilar (com cache) a alternação regex das palavras de controle.
+
+        Uma única busca regex encontra qualquer das frases em um passo —
+        o motor em C substitui o loop Python `for w in palavras: if w in ...`
+        e escala melhor conforme o vocabulário cresce.
+
+        Returns:
+            Tupla (regex compilada, dict UPPER -> palavra original)
+        """
+        chave = tuple(palavras)
+        if self._padrao_cache[0] != chave:
+            pattern = re.compile(
+                "|".join(re.escape(w.upper()) for w in chave)
+            )
+            originais = {w.upper(): w for w in chave}
+            self._padrao_cache = (chave, pattern, originais)
+        return self._padrao_cache[1], self._padrao_cache[2]
+
+    def _tem_voz(self, audio: sr.AudioData) -> bool:
+        """
+        Pré-filtro de voz: True se o chunk contém fala.
+
+        Fatiar o áudio em frames de 30ms a 16kHz e contar os frames com voz
+        segundo o webrtcvad; menos de 3 frames vozeados é ruído/silêncio e
+        não vale o custo do Sphinx. Sem webrtcvad instalado, deixa passar.
+        """
+        if self._vad is None:
+            return True
+
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        frame_bytes = 960  # 30ms * 16kHz * 2 bytes
+        vozeados = 0
+        for i in range(0, len(raw) - frame_bytes + 1, frame_bytes):
+            if self._vad.is_speech(raw[i : i + frame_bytes], 16000):
+                vozeados += 1
+                if vozeados >= 3:
+                    return True
+        return False
+
+    def _publicar_stop(self, result: "_StopResult"):
+        """Publicar o resultado da thread de parada e sinalizar o evento"""
+        self._stop_word_deque.append(result)
+        self._stop_word_event.set()
+
+    def _resolver_sphinx(self, future) -> Optional[str]:
+        """Colher o resultado de um reconhecimento submetido ao pool"""
+        try:
+            return future.result()
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            self.logger.debug("Sphinx recognition failed: %s", e)
+            return None
+
+    # ------------------------------------------------------------------
+    # Wake word
+    # ------------------------------------------------------------------
+
+    async def detectar_wake_word(
+        self, wake_words: List[str], timeout: float = 60.0
+    ) -> Dict[str, Any]:
+        """
+        Escutar o microfone até detectar uma das wake words.
+
+        Args:
+            wake_words: Frases que acordam o assistente (ex.: "NERO OUVIR")
+            timeout: Tempo máximo de escuta em segundos
+
+        Returns:
+            Dict com detected (bool), palavra detectada e audio_data (WAV)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._detectar_wake_word_sync, wake_words, timeout
+        )
+
+    def _detectar_wake_word_sync(
+        self, wake_words: List[str], timeout: float
+    ) -> Dict[str, Any]:
+        """Loop síncrono de escuta/reconhecimento (roda no executor)"""
+        mic = sr.Microphone()
+        inicio = time.time()
+
+        pattern, originais = self._padrao_de_palavras(wake_words)
+
+        # Stream do PortAudio aberto uma vez para a sessão inteira: abrir e
+        # fechar o microfone a cada iteração custava dezenas de ms por chunk
+        with mic as source:
+            # Pipeline: enquanto o Sphinx decodifica o chunk anterior no
+            # pool, o listen() já está capturando o próximo
+            pendente = None
+            while time.time() - inicio < timeout:
+                try:
+                    audio = self.recognizer.listen(
+                        source, timeout=2, phrase_time_limit=3
+                    )
+                except sr.WaitTimeoutError:
+                    audio = None
+
+                anterior, pendente = pendente, None
+                if audio is not None and self._tem_voz(audio):
+                    pendente = (
+                        self._recog_pool.submit(
+                            self.recognizer.recognize_sphinx, audio
+                        ),
+                        audio,
+                    )
+
+                if anterior is None:
+                    continue
+                resultado = self._conferir_wake(anterior, pattern, originais)
+                if resultado is not None:
+                    return resultado
+
+            # Último chunk submetido antes do timeout expirar
+            if pendente is not None:
+                resultado = self._conferir_wake(pendente, pattern, originais)
+                if resultado is not None:
+                    return resultado
+
+        return {"detected": False, "palavra": "", "audio_data": None}
+
+    def _conferir_wake(self, par, pattern, originais) -> Optional[Dict[str, Any]]:
+        """Colher um reconhecimento pendente e testar as wake words"""
+        future, audio = par
+        texto = self._resolver_sphinx(future)
+        if texto is None:
+            return None
+
+        self.logger.debug("Heard: '%s'", texto)
+
+        m = pattern.search(texto.upper())
+        if m is None:
+            return None
+
+        wake_word = originais[m.group(0)]
+        self.logger.stt(f"Wake word detectada: '{wake_word}'")
+        return {
+            "detected": True,
+            "palavra": wake_word,
+            # convert_* explícitos em None: sem eles o speech_recognition
+            # passa pelo audioop.ratecv mesmo quando a taxa já bate
+            "audio_data": audio.get_wav_data(
+                convert_rate=None, convert_width=None
+            ),
+        }
+
+    # ------------------------------------------------------------------
+    # Palavra de parada
+    # ------------------------------------------------------------------
+
+    def aguardar_palavra_parada(
+        self, stop_words: List[str], timeout: float = 600.0
+    ) -> threading.Thread:
+        """
+        Escutar a palavra de parada em uma thread de segundo plano.
+
+        A thread roda em paralelo à gravação do comando: quando reconhece
+        uma das stop words, coloca o resultado em `_stop_word_queue` e
+        encerra. O chamador consulta com `verificar_palavra_parada_detectada`.
+
+        Args:
+            stop_words: Frases que encerram a gravação (ex.: "NERO ENVIAR")
+            timeout: Tempo máximo de escuta em segundos
+
+        Returns:
+            A thread iniciada (daemon)
+        """
+        self._stop_flag.clear()
+        self._stop_word_deque.clear()
+        self._stop_word_event.clear()
+
+        pattern, originais = self._padrao_de_palavras(stop_words)
+
+        def _listen_for_stop():
+            mic = sr.Microphone()
+            # time.monotonic(): a thread não tem event loop, e
+            # get_event_loop() fora da main thread quebra no 3.12
+            inicio = time.monotonic()
+
+            def _conferir_stop(future) -> bool:
+                texto = self._resolver_sphinx(future)
+                if texto is None:
+                    return False
+                self.logger.debug("Stop check heard: '%s'", texto)
+                m = pattern.search(texto.upper())
+                if m is None:
+                    return False
+                stop_word = originais[m.group(0)]
+                self.logger.stt(f"Palavra de parada detectada: '{stop_word}'")
+                self._publicar_stop(_StopResult(True, stop_word, None))
+                return True
+
+            # Mesmo racional do wake word: um único open/close do stream
+            # PortAudio para toda a sessão, com o Sphinx do chunk anterior
+            # rodando no pool durante o listen() do próximo
+            with mic as source:
+                pendente = None
+                while not self._stop_flag.is_set():
+                    if time.monotonic() - inicio > timeout:
+                        self._publicar_stop(_StopResult(False, "", "timeout"))
+                        return
+
+                    try:
+                        audio = self.recognizer.listen(
+                            source, timeout=2, phrase_time_limit=3
+                        )
+                    except sr.WaitTimeoutError:
+                        audio = None
+
+                    anterior, pendente = pendente, None
+                    if audio is not None and self._tem_voz(audio):
+                        pendente = self._recog_pool.submit(
+                            self.recognizer.recognize_sphinx, audio
+                        )
+
+                    if anterior is not None and _conferir_stop(anterior):
+                        return
+
+                if pendente is not None:
+                    _conferir_stop(pendente)
+
+        self._stop_thread = threading.Thread(target=_listen_for_stop, daemon=True)
+        self._stop_thread.start()
+        return self._stop_thread
+
+    def verificar_palavra_parada_detectada(self) -> Optional[Dict[str, Any]]:
+        """
+        Verificar (sem bloquear) se a thread de escuta detectou a parada.
+
+        Returns:
+            Dict com o resultado, ou None se ainda não houver nada
+        """
+        try:
+            # O dict da API pública é reconstruído uma única vez aqui, e não
+            # a cada evento dentro da thread
+            return self._stop_word_deque.popleft()._asdict()
+        except IndexError:
+            return None
+
+    def parar_escuta(self):
+        """Sinalizar para a thread de escuta encerrar"""
+        self._stop_flag.set()
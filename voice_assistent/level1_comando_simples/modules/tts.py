@@ -0,0 +1,458 @@
+"""
+TTS - Síntese de voz com Cartesia
+=================================
+
+Converte a resposta do agente em fala (pt-BR) via API da Cartesia e
+reproduz o áudio no player nativo da plataforma. Vozes disponíveis:
+"ana" (padrão) e "lucas".
+"""
+
+import asyncio
+import functools
+import hashlib
+import os
+import platform
+import shutil
+import tempfile
+import types
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .http import get_shared_client
+from .logger import NeroLogger
+
+# orjson (Rust) serializa o payload da requisição ~5-10x mais rápido que
+# o json da stdlib que o httpx usaria no atalho json=
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json as _json
+
+    def _dumps(obj):
+        return _json.dumps(obj).encode("utf-8")
+
+# Escrita assíncrona em disco durante o streaming da resposta; sem
+# aiofiles, os writes caem no open() síncrono (chunks são pequenos)
+try:
+    import aiofiles
+    _AIOFILES_OK = True
+except ImportError:
+    aiofiles = None
+    _AIOFILES_OK = False
+
+
+class TTS:
+    """
+    Síntese de voz do NERO (Cartesia).
+
+    Uso:
+        tts = TTS()
+        await tts.falar("Olá! Como posso ajudar?")
+    """
+
+    # View imutável: qualquer escrita acidental levanta TypeError, e a
+    # imutabilidade garante que o lru_cache de _get_voice_id nunca serve
+    # um ID desatualizado
+    VOICES = types.MappingProxyType({
+        "ana": "700d1ee3-a641-4018-ba6e-899dcadc9e2b",
+        "lucas": "a0e99841-438c-4a64-b679-ae501e7d6091",
+    })
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        logger: Optional[NeroLogger] = None,
+        max_cache_entries: int = 64,
+    ):
+        """
+        Inicializar o cliente TTS.
+
+        Args:
+            api_key: Chave da API (padrão: variável CARTESIA_API_KEY)
+            logger: Logger compartilhado (cria um próprio se omitido)
+            max_cache_entries: Limite do cache LRU em memória
+        """
+        self.api_key = api_key or os.getenv("CARTESIA_API_KEY", "")
+        self.logger = logger or NeroLogger()
+        self.base_url = "https://api.cartesia.ai/tts/bytes"
+        # Path resolvido uma única vez; gettempdir() por chamada custava
+        # lookups de env e joins repetidos
+        self.temp_dir = Path(tempfile.gettempdir())
+
+        # Auth por requisição: o cliente HTTP é o singleton compartilhado
+        # com o Deepgram (ver modules/http.py)
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Cartesia-Version": "2024-06-10",
+        }
+
+        # Cache de sínteses: frases repetidas (saudações, confirmações,
+        # bordões do agente) pulam o round-trip HTTPS de centenas de ms e
+        # viram um lookup de filesystem. O diretório persiste entre sessões;
+        # o OrderedDict dá a ordem LRU para o índice em memória.
+        self._cache_dir = Path.home() / ".cache" / "nero_tts"
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._mem_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._max_cache_entries = max_cache_entries
+
+        # Players Linux detectados uma vez: aplay só toca WAV/PCM e
+        # falharia em silêncio com o mp3 padrão; ffplay decodifica tudo
+        self._ffplay = shutil.which("ffplay")
+        self._mpg123 = shutil.which("mpg123")
+        self._aplay = shutil.which("aplay")
+
+        # platform.system() resolvido uma vez (pode custar uname()/proc);
+        # o player vira um único lookup de método bound por reprodução
+        self._play_fn = {
+            "Darwin": self._play_darwin,
+            "Linux": self._play_linux,
+            "Windows": self._play_windows,
+        }.get(platform.system(), self._play_unsupported)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartilhado (HTTP/2 + pool, ver modules/http.py)"""
+        return get_shared_client()
+
+    async def warmup(self):
+        """
+        Pré-aquecer a conexão com a Cartesia (DNS + TCP + TLS).
+
+        Disparado em background durante a inicialização: quando a primeira
+        síntese real chegar, o handshake (~100-300ms) já foi pago.
+        """
+        client = self._get_client()
+        try:
+            await client.get(
+                "https://api.cartesia.ai/v1/voices", headers=self._headers
+            )
+        except Exception:
+            # Warm-up é melhor esforço; falha aqui não é erro de operação
+            pass
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _get_voice_id(voz: str) -> str:
+        """Resolver o nome amigável da voz para o ID da Cartesia"""
+        return TTS.VOICES.get(voz.lower(), TTS.VOICES["ana"])
+
+    @staticmethod
+    def _cache_key(
+        texto: str, voice_id: str, estilo: Optional[str], output_format: str
+    ) -> str:
+        """Chave SHA-256 da tupla de request (voz, estilo, formato, texto)"""
+        raw = f"{voice_id}|{estilo}|{output_format}|{texto}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _abrir_temporario(self, output_format: str):
+        """
+        Abrir o destino temporário da síntese.
+
+        No Linux usa O_TMPFILE: um inode anônimo no filesystem do cache,
+        sem nome até o linkat da publicação — se o processo morrer no meio
+        da escrita, o kernel descarta tudo sozinho. Onde O_TMPFILE não
+        existe (macOS/Windows) ou o filesystem não suporta, cai no
+        mkstemp nomeado de sempre.
+
+        Returns:
+            Tupla (fd, tmp_path); tmp_path é None no caminho O_TMPFILE
+        """
+        if hasattr(os, "O_TMPFILE"):
+            try:
+                fd = os.open(
+                    self._cache_dir, os.O_TMPFILE | os.O_WRONLY, 0o600
+                )
+                return fd, None
+            except OSError:
+                # Filesystem sem suporte (NFS, FAT...); usar o fallback
+                pass
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._cache_dir, suffix=f".{output_format}.part"
+        )
+        return fd, tmp_path
+
+    @staticmethod
+    def _publicar_no_cache(fd: int, tmp_path: Optional[str], destino: Path):
+        """Dar nome ao arquivo escrito, atomicamente"""
+        if tmp_path is None:
+            # src_dir_fd força o linkat(2) com AT_SYMLINK_FOLLOW — o link
+            # aponta para o inode por trás do fd. Com caminho simples o
+            # os.link usa link(2), que não atravessa o magic-link de /proc
+            # e falha com EXDEV.
+            proc = os.open("/proc/self", os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.link(
+                    f"fd/{fd}", destino,
+                    src_dir_fd=proc, follow_symlinks=True,
+                )
+            except FileExistsError:
+                # Síntese concorrente do mesmo texto já publicou o
+                # arquivo; o conteúdo é idêntico, nada a fazer
+                pass
+            finally:
+                os.close(proc)
+        else:
+            os.replace(tmp_path, destino)
+
+    def _registrar_no_cache(self, key: str, caminho: str):
+        """Inserir no índice LRU, descartando o mais antigo se necessário"""
+        self._mem_cache[key] = caminho
+        self._mem_cache.move_to_end(key)
+        while len(self._mem_cache) > self._max_cache_entries:
+            self._mem_cache.popitem(last=False)
+
+    async def gerar_audio(
+        self,
+        texto: str,
+        voz: str = "ana",
+        estilo: Optional[str] = None,
+        output_format: str = "mp3",
+    ) -> Dict[str, Any]:
+        """
+        Sintetizar o texto em áudio (com cache LRU em disco).
+
+        Args:
+            texto: Texto a ser falado
+            voz: Nome da voz ("ana" ou "lucas")
+            estilo: Estilo opcional de fala
+            output_format: Formato do áudio gerado ("mp3" ou "wav")
+
+        Returns:
+            Dict com sucesso, caminho_arquivo e se veio do cache
+        """
+        voice_id = self._get_voice_id(voz)
+        key = self._cache_key(texto, voice_id, estilo, output_format)
+        cache_path = self._cache_dir / f"{key}.{output_format}"
+
+        # Hit: memória primeiro (move para o fim = mais recente), senão disco
+        if key in self._mem_cache:
+            self._mem_cache.move_to_end(key)
+            return {
+                "sucesso": True,
+                "caminho_arquivo": self._mem_cache[key],
+                "cache": True,
+            }
+        if cache_path.exists():
+            self._registrar_no_cache(key, str(cache_path))
+            return {
+                "sucesso": True,
+                "caminho_arquivo": str(cache_path),
+                "cache": True,
+            }
+
+        if not self.api_key:
+            self.logger.erro("CARTESIA_API_KEY não configurada")
+            return {"sucesso": False, "erro": "CARTESIA_API_KEY não configurada"}
+
+        self.logger.tts("Gerando áudio para: '%s...'", texto[:50])
+
+        payload = {
+            "model_id": "sonic-multilingual",
+            "transcript": texto,
+            "voice": {"mode": "id", "id": voice_id},
+            "output_format": {
+                "container": output_format,
+                "sample_rate": 44100,
+            },
+            "language": "pt",
+        }
+
+        client = self._get_client()
+
+        # Streaming direto para o disco: cada chunk da rede vai para o
+        # destino temporário sem nunca materializar o áudio completo em
+        # RAM, sobrepondo o recebimento com a escrita. A publicação no
+        # cache é atômica (linkat do inode anônimo ou os.replace) —
+        # nenhum leitor vê MP3 parcial, e chamadas concorrentes não
+        # colidem.
+        fd, tmp_path = self._abrir_temporario(output_format)
+        size = 0
+        try:
+            async with client.stream(
+                "POST",
+                self.base_url,
+                content=_dumps(payload),
+                headers={**self._headers, "Content-Type": "application/json"},
+            ) as response:
+                if response.status_code != 200:
+                    corpo = await response.aread()
+                    self.logger.erro(
+                        f"Cartesia retornou {response.status_code}: "
+                        f"{corpo[:200]!r}"
+                    )
+                    return {
+                        "sucesso": False,
+                        "erro": f"HTTP {response.status_code}",
+                    }
+
+                if _AIOFILES_OK:
+                    async with aiofiles.open(fd, "wb", closefd=False) as f:
+                        async for chunk in response.aiter_bytes(65536):
+                            await f.write(chunk)
+                            size += len(chunk)
+                else:
+                    with open(fd, "wb", closefd=False) as f:
+                        async for chunk in response.aiter_bytes(65536):
+                            f.write(chunk)
+                            size += len(chunk)
+
+            self._publicar_no_cache(fd, tmp_path, cache_path)
+        except (httpx.HTTPError, OSError) as e:
+            self.logger.erro("Falha ao gerar áudio: %s", e)
+            return {"sucesso": False, "erro": str(e)}
+        finally:
+            os.close(fd)
+            # No caminho O_TMPFILE não há nada a limpar: o inode anônimo
+            # não publicado morre junto com o fd
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+        self._registrar_no_cache(key, str(cache_path))
+
+        self.logger.tts("Áudio gerado (%d bytes)", size)
+        return {
+            "sucesso": True,
+            "caminho_arquivo": str(cache_path),
+            "tamanho": size,
+            "cache": False,
+        }
+
+    async def reproduzir_audio(self, caminho_arquivo: str) -> bool:
+        """
+        Reproduzir um arquivo de áudio no player nativo da plataforma.
+
+        Args:
+            caminho_arquivo: Caminho do arquivo gerado
+
+        Returns:
+            True se a reprodução terminou sem erro
+        """
+        # Sem stat de precheck: o player falha imediatamente se o arquivo
+        # não existir, e o exists() só roda no caminho raro de falha para
+        # dar a mensagem precisa (também elimina a corrida com a limpeza)
+        ok = await self._play_fn(caminho_arquivo)
+        if not ok and not os.path.exists(caminho_arquivo):
+            self.logger.erro(
+                f"Arquivo de áudio não encontrado: {caminho_arquivo}"
+            )
+        return ok
+
+    async def _exec_player(self, cmd: list) -> bool:
+        """
+        Executar o player como subprocess assíncrono.
+
+        O event loop continua rodando (escuta, logs, próximas sínteses)
+        enquanto o áudio toca, em vez de travar a máquina de estados pela
+        duração da fala.
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            rc = await proc.wait()
+        except OSError as e:
+            self.logger.erro("Falha ao reproduzir áudio: %s", e)
+            return False
+
+        if rc != 0:
+            self.logger.erro("Player saiu com código %d", rc)
+            return False
+        return True
+
+    async def _play_darwin(self, caminho: str) -> bool:
+        return await self._exec_player(["afplay", caminho])
+
+    async def _play_linux(self, caminho: str) -> bool:
+        # Preferência: ffplay (qualquer formato) > mpg123 (mp3) > aplay (wav)
+        if self._ffplay:
+            return await self._exec_player(
+                [self._ffplay, "-nodisp", "-autoexit", "-loglevel", "quiet", caminho]
+            )
+        if caminho.endswith(".mp3"):
+            if self._mpg123:
+                return await self._exec_player([self._mpg123, "-q", caminho])
+            self.logger.erro(
+                "Nenhum player MP3 encontrado (instale ffplay ou mpg123)"
+            )
+            return False
+        if self._aplay:
+            return await self._exec_player([self._aplay, "-q", caminho])
+        self.logger.erro(
+            "Nenhum player de áudio encontrado (ffplay/mpg123/aplay)"
+        )
+        return False
+
+    async def _play_windows(self, caminho: str) -> bool:
+        # Caminho passado via argv ($args[0]), nunca interpolado na
+        # string do PowerShell
+        return await self._exec_player(
+            [
+                "powershell",
+                "-NoProfile",
+                "-Command",
+                "(New-Object Media.SoundPlayer $args[0]).PlaySync()",
+                caminho,
+            ]
+        )
+
+    async def _play_unsupported(self, caminho: str) -> bool:
+        self.logger.erro("Sistema não suportado: %s", platform.system())
+        return False
+
+    async def falar(self, texto: str, voz: str = "ana") -> bool:
+        """
+        Sintetizar e reproduzir em sequência (atalho de conveniência).
+
+        Args:
+            texto: Texto a ser falado
+            voz: Nome da voz
+
+        Returns:
+            True se gerou e reproduziu com sucesso
+        """
+        resultado = await self.gerar_audio(texto, voz=voz)
+        if not resultado["sucesso"]:
+            return False
+        return await self.reproduzir_audio(resultado["caminho_arquivo"])
+
+    def limpar_arquivos_temporarios(self):
+        """
+        Remover arquivos nero_tts_* antigos do diretório temporário.
+
+        O cache persistente em ~/.cache/nero_tts/ fica intacto — só o
+        lixo de versões antigas em /tmp é varrido.
+        """
+        # os.scandir expõe o dirent do kernel: o prefixo é um compare de
+        # string puro e entry.is_file() não custa stat extra, ao contrário
+        # do glob que stat-ava cada entrada e materializava a lista inteira
+        count = 0
+        try:
+            with os.scandir(self.temp_dir) as it:
+                for entry in it:
+                    if entry.name.startswith("nero_tts_") and entry.is_file():
+                        try:
+                            os.unlink(entry.path)
+                            count += 1
+                        except OSError:
+                            pass
+        except OSError as e:
+            self.logger.erro("Falha ao varrer o diretório temporário: %s", e)
+            return
+        if count:
+            self.logger.tts("%d arquivos temporários removidos", count)
+
+    async def close(self):
+        """
+        Liberar recursos do TTS.
+
+        O cliente HTTP é o singleton compartilhado e é fechado uma única
+        vez pelo NeroAssistant.cleanup (modules.http.close_shared_client).
+        """
@@ -0,0 +1,360 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "claude-agent-sdk",
+#     "rich",
+#     "speechrecognition",
+#     "pocketsphinx",
+#     "pyaudio",
+#     "httpx",
+#     "h2",
+#     "aiofiles",
+# ]
+# ///
+"""
+NERO Assistant - Nível 1 (Comando Simples)
+==========================================
+
+Assistente de voz ativado por wake word:
+
+    "NERO OUVIR"  -> começa a gravar o comando
+    "NERO ENVIAR" -> encerra a gravação e envia ao agente
+
+Fluxo: DESCANSO -> AGUARDANDO -> GRAVANDO -> PROCESSANDO -> RESPONDENDO,
+com STT local (Sphinx) para as palavras de controle, Deepgram para a
+transcrição do comando, Claude Agent SDK para o processamento e Cartesia
+para a resposta falada.
+
+Uso:
+    uv run nero_assistant.py [--verbose]
+"""
+
+import asyncio
+import re
+import sys
+from typing import Any, Dict, List, Optional
+
+# Import pesado hoisted para o topo (era refeito a cada gravação);
+# opcional para ambientes de teste sem stack de áudio
+try:
+    import speech_recognition as sr
+except ImportError:
+    sr = None
+
+from modules.agent_handler import AgentHandler
+from modules.http import close_shared_client
+from modules.logger import NeroLogger
+from modules.stt_fraco import STTFraco
+from modules.stt_forte import STTForte
+from modules.tts import TTS
+
+# Fronteira de sentença (mantém a pontuação na sentença anterior)
+_SENTENCA_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+class MaquinaEstadosNero:
+    """
+    Máquina de estados do assistente.
+
+    Estados e transições são simples o suficiente para um dict + string;
+    a transição valida o destino e loga a mudança.
+    """
+
+    ESTADOS = {
+        "DESCANSO": "Aguardando wake word",
+        "AGUARDANDO": "Wake word detectada, pronto para gravar",
+        "GRAVANDO": "Gravando comando do usuário",
+        "PROCESSANDO": "Processando com o agente",
+        "RESPONDENDO": "Falando a resposta",
+    }
+
+    def __init__(self, logger: NeroLogger):
+        self.logger = logger
+        self.estado = "DESCANSO"
+
+    def transicao(self, novo_estado: str):
+        """Mudar para o novo estado (valida contra ESTADOS)"""
+        if novo_estado not in self.ESTADOS:
+            raise ValueError(f"Estado inválido: {novo_estado}")
+        self.logger.debug("Transição: %s -> %s", self.estado, novo_estado)
+        self.estado = novo_estado
+
+
+class NeroAssistant:
+    """
+    Orquestrador do assistente: liga STT fraco/forte, agente e TTS.
+
+    Uso:
+        assistant = NeroAssistant(verbose=True)
+        asyncio.run(assistant.run())
+    """
+
+    # Timeouts como atributos de classe: o código lê via self (um lookup)
+    # e os testes monkeypatcham valores sub-segundo sem tocar instâncias
+    _RECORDING_TIMEOUT_S = 600.0
+    _PROCESSING_TIMEOUT_S = 120.0
+
+    def __init__(self, verbose: bool = False):
+        """
+        Inicializar o assistente e seus módulos.
+
+        Args:
+            verbose: Habilita logs DEBUG
+        """
+        self.logger = NeroLogger(verbose=verbose)
+        self.state_machine = MaquinaEstadosNero(self.logger)
+
+        self.stt_fraco = STTFraco(logger=self.logger)
+        self.stt_forte = STTForte(logger=self.logger)
+        self.tts = TTS(logger=self.logger)
+        self.agent = AgentHandler(logger=self.logger)
+
+        self.wake_words = ["NERO OUVIR", "NERO"]
+        self.stop_words = ["NERO ENVIAR", "ENVIAR"]
+        self.running = False
+
+        # Alternações compiladas uma vez: um único search em C por texto,
+        # em vez de O(palavras) comparações Python por candidato
+        self._wake_re = re.compile(
+            r"\b(" + "|".join(re.escape(w) for w in self.wake_words) + r")\b",
+            re.IGNORECASE,
+        )
+        self._stop_re = re.compile(
+            r"\b(" + "|".join(re.escape(w) for w in self.stop_words) + r")\b",
+            re.IGNORECASE,
+        )
+
+    def match_wake(self, texto: str) -> Optional[str]:
+        """Wake word presente no texto (ou None)"""
+        m = self._wake_re.search(texto)
+        return m.group(1) if m else None
+
+    def match_stop(self, texto: str) -> Optional[str]:
+        """Palavra de parada presente no texto (ou None)"""
+        m = self._stop_re.search(texto)
+        return m.group(1) if m else None
+
+    # ------------------------------------------------------------------
+    # Estados
+    # ------------------------------------------------------------------
+
+    async def estado_descanso(self) -> bool:
+        """DESCANSO: escutar até a wake word (True se detectada)"""
+        self.logger.aguardando("Aguardando wake word ('NERO OUVIR')...")
+        resultado = await self.stt_fraco.detectar_wake_word(self.wake_words)
+        if resultado["detected"]:
+            self.state_machine.transicao("AGUARDANDO")
+            return True
+        return False
+
+    async def estado_aguardando(self):
+        """AGUARDANDO: confirmar a ativação e preparar a gravação"""
+        self.logger.sucesso("Wake word detectada! Pode falar o comando.")
+        self.state_machine.transicao("GRAVANDO")
+
+    async def estado_gravando(self) -> str:
+        """
+        GRAVANDO: capturar o comando até a palavra de parada.
+
+        Returns:
+            Transcrição do comando (string vazia se nada foi gravado)
+        """
+        if sr is None:
+            self.logger.erro("speech_recognition não instalado")
+            self.state_machine.transicao("DESCANSO")
+            return ""
+
+        self.logger.gravando(
+            "Gravando comando... (diga 'NERO ENVIAR' para enviar)"
+        )
+        self.stt_fraco.aguardar_palavra_parada(
+            self.stop_words, timeout=self._RECORDING_TIMEOUT_S
+        )
+
+        recognizer = sr.Recognizer()
+        mic = sr.Microphone()
+        frames: List[bytes] = []
+        loop = asyncio.get_running_loop()
+
+        try:
+            with mic as source:
+                while True:
+                    stop = self.stt_fraco.verificar_palavra_parada_detectada()
+                    if stop is not None:
+                        if not stop["detected"]:
+                            self.logger.aviso("Tempo de gravação esgotado")
+                        break
+                    try:
+                        audio = await loop.run_in_executor(
+                            None,
+                            lambda: recognizer.listen(
+                                source, timeout=1, phrase_time_limit=5
+                            ),
+                        )
+                        frames.append(audio.get_wav_data())
+                    except sr.WaitTimeoutError:
+                        continue
+        except Exception as e:
+            self.logger.erro("Erro na gravação: %s", e)
+            self.stt_fraco.parar_escuta()
+            self.state_machine.transicao("DESCANSO")
+            return ""
+
+        self.stt_fraco.parar_escuta()
+
+        if not frames:
+            self.logger.aviso("Nenhum áudio gravado")
+            self.state_machine.transicao("DESCANSO")
+            return ""
+
+        self.state_machine.transicao("PROCESSANDO")
+        transcricao = await self.stt_forte.transcrever_audio_file(
+            b"".join(frames)
+        )
+        if not transcricao:
+            self.logger.aviso("Transcrição vazia")
+            self.state_machine.transicao("DESCANSO")
+            return ""
+
+        self.logger.stt("Transcrição: '%s'", transcricao)
+        return transcricao
+
+    async def estado_processando(self, transcricao: str):
+        """
+        PROCESSANDO: pipeline agente -> TTS -> reprodução.
+
+        A resposta do agente chega em chunks; cada sentença completa vira
+        uma task de síntese dentro do TaskGroup enquanto o agente ainda
+        gera o restante. As tasks entram em ordem numa fila e um único
+        consumidor reproduz sequencialmente — síntese em paralelo,
+        reprodução serializada.
+        """
+        self.logger.processando("Enviando ao agente...")
+        self.state_machine.transicao("RESPONDENDO")
+        self.logger.respondendo("Falando a resposta...")
+
+        fila: asyncio.Queue = asyncio.Queue()
+
+        async def _playback():
+            while True:
+                task = await fila.get()
+                if task is None:
+                    return
+                resultado = await task
+                if resultado["sucesso"]:
+                    await self.tts.reproduzir_audio(
+                        resultado["caminho_arquivo"]
+                    )
+
+        try:
+            async with asyncio.timeout(self._PROCESSING_TIMEOUT_S), \
+                    asyncio.TaskGroup() as tg:
+                tg.create_task(_playback())
+                pendente = ""
+                async for chunk in self.agent.processar_prompt_stream(
+                    transcricao
+                ):
+                    pendente += chunk
+                    *completas, pendente = _SENTENCA_RE.split(pendente)
+                    for sentenca in completas:
+                        sentenca = sentenca.strip()
+                        if sentenca:
+                            await fila.put(
+                                tg.create_task(
+                                    self.tts.gerar_audio(sentenca, voz="ana")
+                                )
+                            )
+                pendente = pendente.strip()
+                if pendente:
+                    await fila.put(
+                        tg.create_task(self.tts.gerar_audio(pendente, voz="ana"))
+                    )
+                await fila.put(None)
+        except* TimeoutError:
+            self.logger.erro(
+                "Processamento excedeu %.0fs", self._PROCESSING_TIMEOUT_S
+            )
+        except* Exception as eg:
+            self.logger.erro("Agente falhou: %s", eg.exceptions[0])
+
+        self.state_machine.transicao("DESCANSO")
+
+    # ------------------------------------------------------------------
+    # Loop principal
+    # ------------------------------------------------------------------
+
+    async def run(self):
+        """Loop principal do assistente (Ctrl+C para sair)"""
+        self.logger.print_banner()
+        self.running = True
+
+        # Handshakes TLS pagos em background enquanto o usuário ainda nem
+        # falou a wake word; não aguardamos de propósito
+        warmups = [
+            asyncio.create_task(self.tts.warmup()),
+            asyncio.create_task(self.stt_forte.warmup()),
+        ]
+
+        try:
+            while self.running:
+                if not await self.estado_descanso():
+                    continue
+                await self.estado_aguardando()
+                transcricao = await self.estado_gravando()
+                if not transcricao:
+                    continue
+                await self.estado_processando(transcricao)
+        except KeyboardInterrupt:
+            self.logger.info("Interrompido pelo usuário")
+        finally:
+            for task in warmups:
+                task.cancel()
+            await self.cleanup()
+
+    def close_sync(self):
+        """
+        Subconjunto síncrono do cleanup, para contextos sem event loop.
+
+        Útil em teardown de testes (onde os clientes async estão
+        mockados e não há nada de corrotina a finalizar) e em handlers
+        de saída: para a escuta, baixa a flag e varre os temporários.
+        O fechamento dos clientes async continua em cleanup().
+        """
+        self.running = False
+        self.stt_fraco.parar_escuta()
+        self.tts.limpar_arquivos_temporarios()
+
+    async def cleanup(self):
+        """Encerrar módulos e liberar recursos"""
+        self.logger.info("Encerrando NERO...")
+        self.running = False
+        self.stt_fraco.parar_escuta()
+        await self.agent.close()
+        await self.stt_forte.close()
+        await self.tts.close()
+        # O singleton HTTP compartilhado (Deepgram + Cartesia) fecha aqui,
+        # uma única vez
+        await close_shared_client()
+        self.tts.limpar_arquivos_temporarios()
+        resumo = self.agent.resumo_sessao()
+        self.logger.info(
+            "Sessão: %d interações, ~$%.4f",
+            resumo["interacoes"],
+            resumo["custo_total"],
+        )
+        self.logger.sucesso("Até logo!")
+
+
+async def main():
+    """Entry point"""
+    verbose = "--verbose" in sys.argv or "-v" in sys.argv
+    assistant = NeroAssistant(verbose=verbose)
+    await assistant.run()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
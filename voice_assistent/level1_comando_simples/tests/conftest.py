@@ -0,0 +1,51 @@
+"""
+Fixtures compartilhadas dos testes do NERO Nível 1.
+
+Os arquivos de projeto e os imports dos módulos são hoisted para
+fixtures de escopo de sessão: cada worker do pytest paga o I/O e o
+custo de import uma única vez, em vez de uma vez por teste.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Raiz do projeto (nível acima de tests/), também adicionada ao sys.path
+# para que `import modules.*` funcione de qualquer diretório de invocação
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+
+@pytest.fixture(scope="session")
+def project_files():
+    """Conteúdo dos arquivos de configuração do projeto (lido uma vez)"""
+    return {
+        "env": (_ROOT / ".env.example").read_text(),
+        "gitignore": (_ROOT / ".gitignore").read_text(),
+        "readme": (_ROOT / "README.md").read_text(
+            encoding="utf-8", errors="replace"
+        ),
+    }
+
+
+@pytest.fixture(scope="session")
+def modules():
+    """Módulos do assistente importados uma vez por sessão"""
+    import modules.agent_handler
+    import modules.http
+    import modules.logger
+    import modules.stt_fraco
+    import modules.stt_forte
+    import modules.tts
+
+    return SimpleNamespace(
+        agent_handler=modules.agent_handler,
+        http=modules.http,
+        logger=modules.logger,
+        stt_fraco=modules.stt_fraco,
+        stt_forte=modules.stt_forte,
+        tts=modules.tts,
+    )
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Gerador de fixtures de áudio para os testes do NERO.
+
+Sintetiza via Cartesia os WAVs usados pelos testes que precisam de áudio
+real (wake word, palavra de parada, comandos de exemplo) e os publica em
+tests/fixtures/. Requer CARTESIA_API_KEY real no ambiente — a suíte
+mockada (pytest) não depende destes arquivos.
+
+Uso:
+    python tests/generate_fixtures.py
+
+Com `pip install -e .` (na raiz do nível, pacote nero_level1) o script
+fica importável de qualquer diretório, sem depender do ajuste de
+sys.path abaixo.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import hashlib
+import os
+import re
+import shutil
+import sys
+
+# Com `pip install -e .` (pyproject na raiz do nível) o pacote é
+# instalado como nero_level1 e resolve pelos finders cacheados do import
+# system; aqui ele é aliasado para "modules", o nome usado no checkout.
+# O insert em sys.path fica só como fallback para execução direta sem
+# instalação.
+try:
+    import modules  # noqa: F401
+except ImportError:
+    try:
+        import nero_level1
+
+        sys.modules["modules"] = nero_level1
+    except ImportError:
+        sys.path.insert(
+            0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        )
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from modules.http import close_shared_client
+from modules.logger import NeroLogger
+from modules.tts import TTS
+
+# ----------------------------------------------------------------------
+# Fixtures a sintetizar
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Fixture:
+    """Um WAV a sintetizar: registro imutável, com slots (sem dict por
+    instância — acesso a atributo vira offset fixo em vez de hash lookup)."""
+
+    filename: str
+    text: str
+    description: str
+
+
+FIXTURES: tuple[Fixture, ...] = (
+    Fixture("wake_word_nero_ouvir.wav", "NERO OUVIR", "Wake word completa"),
+    Fixture("wake_word_nero.wav", "NERO", "Wake word curta"),
+    Fixture(
+        "stop_word_nero_enviar.wav", "NERO ENVIAR",
+        "Palavra de parada completa",
+    ),
+    Fixture("stop_word_enviar.wav", "ENVIAR", "Palavra de parada curta"),
+    Fixture("prompt_horas.wav", "que horas são", "Comando simples"),
+    Fixture(
+        "prompt_temperatura.wav", "qual a temperatura em são paulo",
+        "Comando com entidade",
+    ),
+    Fixture("prompt_piada.wav", "me conte uma piada curta", "Comando criativo"),
+    Fixture(
+        "prompt_codigo_fibonacci.wav",
+        (
+            "escreva uma função em python que calcule a sequência de "
+            "fibonacci de forma iterativa, explique a complexidade do "
+            "algoritmo e mostre um exemplo de uso imprimindo os dez "
+            "primeiros números da sequência"
+        ),
+        "Prompt longo (código)",
+    ),
+)
+
+VOZ = "ana"
+
+# Teto de sínteses simultâneas: alto o bastante para amortizar a latência
+# da API, baixo o bastante para não provocar 429 na Cartesia quando a
+# lista de fixtures crescer
+MAX_CONCURRENT_TTS = 4
+
+# Sentinelas comuns de chave não preenchida (.env.example, docs, CI):
+# uma única alternação compilada em vez de uma cadeia de startswith
+_PLACEHOLDER_RE = re.compile(r"^(?:your_|<|xxx|placeholder)", re.IGNORECASE)
+
+
+def _hash_conteudo(text: str, voz: str) -> str:
+    """Hash que identifica a síntese: mesmo (texto, voz) => mesmo WAV."""
+    return hashlib.sha256(f"{text}|{voz}".encode()).hexdigest()
+
+
+def _replicar(origem: Path, destino: Path):
+    """Duplicar um WAV já sintetizado: hardlink (grátis, mesmo inode)
+    com fallback para cópia em volumes que não suportam link."""
+    destino.unlink(missing_ok=True)
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copyfile(origem, destino)
+
+
+class BufferedLogger:
+    """
+    Adaptador que acumula eventos de log num deque e os emite em lote.
+
+    Cada fixture gera 2-3 linhas e o print do Rich é síncrono,
+    serializado no lock do console: com vários workers, o logger vira
+    ponto de contenção. O buffer tira o I/O do caminho concorrente;
+    flush() (chamado ao fim de cada grupo) emite tudo de uma vez.
+    """
+
+    def __init__(self, logger: NeroLogger):
+        self._logger = logger
+        self._eventos: deque = deque()
+
+    def __getattr__(self, level: str):
+        if level.startswith("_"):
+            raise AttributeError(level)
+
+        def _registrar(message: str, *args):
+            self._eventos.append((level, message, args))
+
+        return _registrar
+
+    def flush(self):
+        """Emitir os eventos acumulados na ordem em que ocorreram."""
+        while self._eventos:
+            level, message, args = self._eventos.popleft()
+            getattr(self._logger, level)(message, *args)
+
+
+class FixturePool:
+    """
+    Fila de grupos de fixtures drenada por workers persistentes.
+
+    Em vez de um lote fechado (gather que só libera quando o lote
+    inteiro termina), os grupos entram numa asyncio.Queue e os workers
+    os consomem conforme há capacidade: um submit() feito durante a
+    drenagem entra na iteração corrente em vez de esperar o lote
+    anterior. Isso deixa o gerador reutilizável como serviço de
+    fixtures sob demanda (CI), mantendo a CLI com a semântica de lote
+    via drain().
+    """
+
+    def __init__(
+        self,
+        tts: TTS,
+        fixtures_dir: Path,
+        logger,  # NeroLogger ou BufferedLogger
+        force: bool = False,
+        jobs: int = MAX_CONCURRENT_TTS,
+        voz: str = VOZ,
+    ):
+        self.tts = tts
+        self.fixtures_dir = fixtures_dir
+        self.logger = logger
+        self.force = force
+        self.voz = voz
+        self.success_count = 0
+        # Path absoluto de cada fixture construído uma única vez: a
+        # normalização do pathlib em __truediv__ sai do caminho quente
+        self._out_paths: dict[str, Path] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # O semáforo cerca só a chamada à Cartesia: replicação e
+        # verificação local não seguram vaga de rede
+        self._sem = asyncio.Semaphore(jobs)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(jobs)
+        ]
+
+    def _out_path(self, filename: str) -> Path:
+        p = self._out_paths.get(filename)
+        if p is None:
+            p = self._out_paths[filename] = self.fixtures_dir / filename
+        return p
+
+    def submit(self, fxs: list[Fixture]):
+        """Enfileirar um grupo de fixtures com o mesmo (texto, voz)."""
+        self._queue.put_nowait(fxs)
+
+    async def drain(self):
+        """Aguardar a fila esvaziar (todos os grupos processados)."""
+        await self._queue.join()
+
+    async def close(self):
+        """Encerrar os workers após o drain."""
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    async def _worker(self):
+        while True:
+            fxs = await self._queue.get()
+            try:
+                self.success_count += await self._gen_group(fxs)
+            except Exception as e:
+                self.logger.erro("%s: %s", fxs[0].filename, e)
+            finally:
+                if hasattr(self.logger, "flush"):
+                    self.logger.flush()
+                self._queue.task_done()
+
+    async def _gen_one(self, fx: Fixture) -> bool:
+        """Sintetizar e verificar um único fixture."""
+        output_path = self._out_path(fx.filename)
+        # Cache por conteúdo: o sidecar .sha256 guarda o hash de
+        # (texto, voz) da última síntese; se nada mudou, reexecutar o
+        # script custa um stat em vez de uma requisição à Cartesia
+        sidecar = output_path.with_name(output_path.name + ".sha256")
+        h = _hash_conteudo(fx.text, self.voz)
+        if not self.force:
+            try:
+                os.stat(output_path)
+                cache_ok = sidecar.read_text().strip() == h
+            except FileNotFoundError:
+                cache_ok = False
+            if cache_ok:
+                self.logger.info("%s inalterado (cache)", fx.filename)
+                return True
+        self.logger.tts("Gerando %s (%s)...", fx.filename, fx.description)
+        try:
+            async with self._sem:
+                resultado = await self.tts.gerar_audio(
+                    fx.text, voz=self.voz, output_format="wav"
+                )
+            if not resultado["sucesso"]:
+                self.logger.erro(
+                    "%s: %s", fx.filename, resultado.get("erro", "?")
+                )
+                return False
+            # gerar_audio já grava em streaming no cache do TTS (chunk a
+            # chunk, conforme os bytes chegam da Cartesia); daqui só resta
+            # materializar a cópia com nome legível ao lado dos testes.
+            # copyfile usa sendfile no Linux: nada do WAV passa pelo heap
+            # do Python, então o pico de RSS independe do tamanho do prompt.
+            # A cópia vai para um .tmp e só o os.replace (atômico no mesmo
+            # filesystem) publica o nome final: um Ctrl-C no meio nunca
+            # deixa um WAV truncado que os testes tomariam por válido
+            tmp = output_path.with_name(output_path.name + ".tmp")
+            try:
+                shutil.copyfile(resultado["caminho_arquivo"], tmp)
+                os.replace(tmp, output_path)
+            finally:
+                tmp.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.erro("%s: %s", fx.filename, e)
+            return False
+
+        # Um stat só: exists() seguido de stat() custaria duas idas ao
+        # kernel para responder a mesma pergunta
+        try:
+            size_kb = os.stat(output_path).st_size / 1024
+        except FileNotFoundError:
+            self.logger.erro("%s: arquivo não foi criado", fx.filename)
+            return False
+        sidecar.write_text(h)
+        self.logger.sucesso("%s pronto (%.1f KB)", fx.filename, size_kb)
+        return True
+
+    async def _gen_group(self, fxs: list[Fixture]) -> int:
+        """Sintetizar o primeiro fixture do grupo e replicar os demais."""
+        canonical, *extras = fxs
+        if not await self._gen_one(canonical):
+            return 0
+        count = 1
+        origem = self._out_path(canonical.filename)
+        h = _hash_conteudo(canonical.text, self.voz)
+        for fx in extras:
+            destino = self._out_path(fx.filename)
+            try:
+                _replicar(origem, destino)
+                destino.with_name(destino.name + ".sha256").write_text(h)
+                self.logger.sucesso(
+                    "%s replicado de %s", fx.filename, canonical.filename
+                )
+                count += 1
+            except OSError as e:
+                self.logger.erro("%s: %s", fx.filename, e)
+        return count
+
+
+async def generate_fixtures(
+    force: bool = False,
+    jobs: int = MAX_CONCURRENT_TTS,
+    voz: str = VOZ,
+    filtro: str = "*",
+) -> tuple[int, int]:
+    """Gerar os WAVs de FIXTURES que casam com o filtro.
+
+    Retorna (sucessos, selecionadas).
+    """
+    logger = NeroLogger()
+
+    cartesia_key = os.getenv("CARTESIA_API_KEY", "")
+    if not cartesia_key or _PLACEHOLDER_RE.match(cartesia_key):
+        logger.erro(
+            "CARTESIA_API_KEY ausente ou placeholder — configure o .env "
+            "com uma chave real antes de gerar fixtures"
+        )
+        return 0, 0
+
+    fixtures_dir = Path(__file__).parent / "fixtures"
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    # Resolvido uma vez: todos os paths derivados já nascem absolutos
+    fixtures_dir = fixtures_dir.resolve()
+
+    # O TTS usa o AsyncClient compartilhado de modules.http (HTTP/2,
+    # keep-alive): todas as sínteses concorrentes multiplexam as mesmas
+    # conexões TLS em vez de pagar handshake por fixture
+    tts = TTS(logger=logger)
+    # Os workers logam via buffer, esvaziado a cada grupo concluído: o
+    # print síncrono do Rich sai do caminho concorrente
+    pool = FixturePool(tts, fixtures_dir, BufferedLogger(logger),
+                       force=force, jobs=jobs, voz=voz)
+
+    # Filtro por glob no nome do arquivo (--filter 'prompt_*' regenera
+    # só o subconjunto que mudou), depois dedup antes de despachar:
+    # entradas com o mesmo (texto, voz) produziriam WAVs idênticos,
+    # então só a primeira de cada grupo vai à Cartesia e as demais
+    # viram hardlink do resultado
+    selecionadas = [
+        fx for fx in FIXTURES if fnmatch.fnmatch(fx.filename, filtro)
+    ]
+    groups: dict[tuple[str, str], list[Fixture]] = {}
+    for fx in selecionadas:
+        groups.setdefault((fx.text, voz), []).append(fx)
+
+    # Texto mais longo primeiro (LPT): como os workers admitem na ordem
+    # da fila, o prompt-baleia (fibonacci) começa já na primeira leva e
+    # os curtos preenchem o fim, em vez de ele rodar sozinho na cauda
+    for fxs in sorted(groups.values(), key=lambda g: -len(g[0].text)):
+        pool.submit(fxs)
+    await pool.drain()
+    await pool.close()
+
+    await tts.close()
+    await close_shared_client()
+
+    logger.info(
+        "Fixtures geradas: %d/%d", pool.success_count, len(selecionadas)
+    )
+    return pool.success_count, len(selecionadas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerar mesmo com cache .sha256 válido",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=MAX_CONCURRENT_TTS,
+        help="sínteses simultâneas (padrão: %(default)s)",
+    )
+    parser.add_argument(
+        "--voice",
+        default=VOZ,
+        help="voz da Cartesia (padrão: %(default)s)",
+    )
+    parser.add_argument(
+        "--filter",
+        default="*",
+        help="glob sobre o nome do arquivo (ex.: 'prompt_*')",
+    )
+    args = parser.parse_args()
+    # uvloop (libuv) reduz o overhead de scheduling do loop quando o
+    # gather sobe a concorrência; opcional, como as demais dependências
+    # aceleradoras do projeto
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    ok, total = asyncio.run(generate_fixtures(
+        force=args.force,
+        jobs=args.jobs,
+        voz=args.voice,
+        filtro=args.filter,
+    ))
+    sys.exit(0 if total and ok == total else 1)
+
+
+if __name__ == "__main__":
+    main()
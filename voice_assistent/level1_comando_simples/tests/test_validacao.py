@@ -0,0 +1,50 @@
+"""
+Validação estrutural do projeto NERO Nível 1.
+
+Confere que os arquivos de configuração documentam as chaves esperadas
+e que os módulos do assistente importam e expõem suas classes públicas.
+Usa as fixtures de sessão de conftest.py (project_files, modules) para
+não repetir I/O nem imports por teste.
+"""
+
+
+def test_env_example_documenta_chaves(project_files):
+    """O .env.example lista as chaves de API dos serviços externos"""
+    env = project_files["env"]
+    assert "ANTHROPIC_API_KEY" in env
+    assert "DEEPGRAM_API_KEY" in env
+    assert "CARTESIA_API_KEY" in env
+
+
+def test_gitignore_protege_segredos(project_files):
+    """O .gitignore cobre .env e artefatos de build/cache"""
+    gitignore = project_files["gitignore"]
+    assert ".env" in gitignore
+    assert "__pycache__" in gitignore
+
+
+def test_readme_documenta_uso(project_files):
+    """O README descreve as wake words e o comando de execução"""
+    readme = project_files["readme"]
+    assert "NERO OUVIR" in readme
+    assert "NERO ENVIAR" in readme
+    assert "nero_assistant.py" in readme
+
+
+def test_modulos_importam(modules):
+    """Todos os módulos do assistente importam sem dependências faltando"""
+    assert modules.logger is not None
+    assert modules.stt_fraco is not None
+    assert modules.stt_forte is not None
+    assert modules.tts is not None
+    assert modules.agent_handler is not None
+    assert modules.http is not None
+
+
+def test_modulos_expoem_classes_publicas(modules):
+    """As classes principais existem com os nomes esperados"""
+    assert hasattr(modules.logger, "NeroLogger")
+    assert hasattr(modules.stt_fraco, "STTFraco")
+    assert hasattr(modules.stt_forte, "STTForte")
+    assert hasattr(modules.tts, "TTS")
+    assert hasattr(modules.agent_handler, "AgentHandler")